@@ -12,7 +12,7 @@ setup(
     python_requires=">=3.8",
     install_requires=[
         "torch>=2.0.0",
-        "openai-whisper>=20230918",
+        "openai-whisper>=20231117",
         "numpy>=1.20.0",
         "tqdm>=4.62.0",
         "pathlib>=1.0.1",
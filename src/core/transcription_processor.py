@@ -1,21 +1,250 @@
+import dataclasses
+import json
 import logging
 import os
+import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from queue import Queue
+from queue import Empty, Queue
+import ffmpeg
+import numpy as np
 import torch
+import torch.multiprocessing as mp
 import whisper
+from torch.utils.data import Dataset, DataLoader
 from typing import List, Tuple, Dict, Optional, Union, Any
 
-# Import for CUDA error detection
+# Sample rate expected by Whisper
 from whisper.audio import SAMPLE_RATE
+from whisper.decoding import DecodingTask
+from whisper.utils import format_timestamp, get_writer
+
+try:
+    # Optional: faster JSON serialization for the json output format
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Optional: decodes uncompressed/lossless audio in-process without spawning ffmpeg
+    import torchaudio
+except ImportError:
+    torchaudio = None
 
 logger = logging.getLogger(__name__)
 
+# Models already loaded in this process, keyed by (backend, model_name, device)
+_MODEL_CACHE = {}
+
+# Pre-converted checkpoints that can be memory-mapped by later runs
+CHECKPOINT_CACHE_DIR = Path.home() / ".cache" / "whisper_batch"
+# Part of the checkpoint file name; bump it when the stored weights change, so
+# checkpoints written by an older version are converted again instead of loaded
+# (2: LayerNorm weights kept in float32 in the float16 checkpoints)
+CHECKPOINT_FORMAT_VERSION = 2
+# torch.load(mmap=True) and load_state_dict(assign=True) need PyTorch 2.1
+_TORCH_MMAP_LOAD = tuple(int(part) for part in torch.__version__.split(".")[:2]) >= (2, 1)
+
+# Error messages that indicate a GPU failure worth retrying on CPU
+_CUDA_ERR_RE = re.compile(r"cuda|cudnn|gpu|nvrtc|cublas|out of memory|device-side assert", re.IGNORECASE)
+
+# Formats torchaudio can read in-process through its soundfile/sox backends
+TORCHAUDIO_EXTENSIONS = {".wav", ".flac", ".ogg"}
+
+# Write buffer for transcript files; large enough that most transcripts reach the
+# disk in a single write() however many small pieces the writers emit
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+def _decode_audio(path):
+    """
+    Decode an audio file to mono float32 samples at Whisper's sample rate.
+    
+    Args:
+        path (Path): Path object for the audio file
+        
+    Returns:
+        np.ndarray: Mono float32 samples at 16 kHz
+    """
+    if torchaudio is not None and path.suffix.lower() in TORCHAUDIO_EXTENSIONS:
+        try:
+            wave, sample_rate = torchaudio.load(str(path))
+            wave = wave.mean(dim=0)
+            if sample_rate != SAMPLE_RATE:
+                wave = torchaudio.functional.resample(wave, sample_rate, SAMPLE_RATE)
+            return wave.numpy()
+        except Exception as e:
+            logger.debug(f"torchaudio could not decode {path}, using ffmpeg: {e}")
+    
+    # Stream raw PCM from ffmpeg's stdout instead of going through an intermediate file
+    out, _ = (
+        ffmpeg
+        .input(str(path), threads=0)
+        .output("pipe:", format="s16le", acodec="pcm_s16le", ac=1, ar=SAMPLE_RATE)
+        .run(capture_stdout=True, capture_stderr=True, quiet=True)
+    )
+    return np.frombuffer(out, np.int16).astype(np.float32) / 32768.0
+
+def _log_mel_into(audio, out):
+    """
+    Compute whisper.log_mel_spectrogram of one 30s window into a preallocated tensor.
+    
+    Args:
+        audio (Tensor): Samples of a window padded or trimmed to N_SAMPLES, on out's device
+        out (Tensor): float32 tensor of shape (n_mels, N_FRAMES) receiving the mel
+        
+    Returns:
+        Tensor: out
+    """
+    window = torch.hann_window(whisper.audio.N_FFT, device=audio.device)
+    stft = torch.stft(audio, whisper.audio.N_FFT, whisper.audio.HOP_LENGTH, window=window, return_complex=True)
+    magnitudes = stft[..., :-1].abs().square_()
+    
+    # Same steps as log_mel_spectrogram, done in place on out
+    torch.matmul(whisper.audio.mel_filters(audio.device, out.shape[0]), magnitudes, out=out)
+    out.clamp_(min=1e-10).log10_()
+    out.clamp_(min=out.max() - 8.0)
+    return out.add_(4.0).div_(4.0)
+
+def _half_except_layer_norms(model):
+    """
+    Convert a Whisper model to float16, keeping the LayerNorm parameters in float32.
+    
+    whisper's LayerNorm computes in float32 (x.float()) and F.layer_norm requires
+    its weight and bias in the input's dtype, so half-precision LayerNorm
+    parameters fail on CUDA with "expected scalar type Float but found Half".
+    The Linear and Conv1d layers cast their weights to the input dtype and are
+    the ones that benefit from float16 storage.
+    """
+    model = model.half()
+    for module in model.modules():
+        if isinstance(module, torch.nn.LayerNorm):
+            module.float()
+    return model
+
+class _CUDAGraphEncoder(torch.nn.Module):
+    """
+    Wrapper that replays the Whisper audio encoder from captured CUDA graphs.
+    
+    The encoder always sees fixed-shape (batch, n_mels, 3000) mel windows, so one
+    graph per (shape, dtype) is captured on first use and replayed afterwards,
+    replacing dozens of kernel launches per window with a single graph launch.
+    """
+    
+    def __init__(self, encoder, warmup_iters=3):
+        super().__init__()
+        self.encoder = encoder
+        self.warmup_iters = warmup_iters
+        self._graphs = {}
+        
+    def _capture(self, x):
+        """Capture the encoder forward pass for the shape and dtype of x."""
+        static_input = x.clone()
+        
+        # Warm up on a side stream so lazy initialization is not recorded in the graph
+        stream = torch.cuda.Stream()
+        stream.wait_stream(torch.cuda.current_stream())
+        with torch.cuda.stream(stream):
+            for _ in range(self.warmup_iters):
+                self.encoder(static_input)
+        torch.cuda.current_stream().wait_stream(stream)
+        
+        graph = torch.cuda.CUDAGraph()
+        with torch.cuda.graph(graph):
+            static_output = self.encoder(static_input)
+            
+        return graph, static_input, static_output
+        
+    @torch.no_grad()
+    def forward(self, x):
+        if not x.is_cuda:
+            return self.encoder(x)
+            
+        key = (tuple(x.shape), x.dtype)
+        if key not in self._graphs:
+            self._graphs[key] = self._capture(x)
+            
+        graph, static_input, static_output = self._graphs[key]
+        static_input.copy_(x)
+        graph.replay()
+        
+        # The static output is overwritten on the next replay
+        return static_output.clone()
+
+class AudioDataset(Dataset):
+    """Dataset that decodes audio files and computes the language-detection mel in worker processes."""
+    
+    def __init__(self, files, n_mels=80):
+        """
+        Initialize the dataset.
+        
+        Args:
+            files (list): List of Path objects for audio files
+            n_mels (int): Number of mel bins expected by the model
+        """
+        self.files = files
+        self.n_mels = n_mels
+        
+    def __len__(self):
+        return len(self.files)
+        
+    def __getitem__(self, index):
+        file = self.files[index]
+        try:
+            audio = _decode_audio(file)
+            mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(audio[:30 * SAMPLE_RATE]), n_mels=self.n_mels)
+            return index, torch.from_numpy(audio), mel
+        except Exception as e:
+            # Let _process_single_file decode the file again and report the error
+            logger.warning(f"Prefetch failed for {file}: {e}")
+            return index, None, None
+
+def _collate_single(sample):
+    """Return the sample unchanged (module-level so spawned workers can pickle it)."""
+    return sample
+
+def _worker_entry(rank, shards, devices, processor_kwargs, events):
+    """
+    Entry point of a process_files_parallel worker process.
+    
+    Args:
+        rank (int): Worker index supplied by torch.multiprocessing.spawn
+        shards (list): Per-worker lists of Path objects
+        devices (list): Per-worker device strings ('cuda:<k>' or 'cpu')
+        processor_kwargs (dict): Keyword arguments for the worker's TranscriptionProcessor
+        events: Multiprocessing queue for progress events sent back to the parent
+    """
+    device = devices[rank]
+    if device.startswith("cuda"):
+        torch.cuda.set_device(int(device.split(":")[1]))
+        device = "cuda"
+    else:
+        # Split the cores between the workers instead of oversubscribing them
+        torch.set_num_threads(max(1, (os.cpu_count() or 1) // len(devices)))
+        
+    processor = TranscriptionProcessor(device=device, progress_queue=Queue(), **processor_kwargs)
+    
+    # Relay the worker's progress to the parent as it happens
+    relay = threading.Thread(target=_relay_events, args=(rank, processor.progress_queue, events), daemon=True)
+    relay.start()
+    processor.process_files(shards[rank])
+    relay.join()
+
+def _relay_events(rank, source, events):
+    """Forward progress events from a worker's local queue to the parent until it completes."""
+    while True:
+        event = source.get()
+        events.put((rank, event))
+        if event[0] in ("complete", "error"):
+            return
+
 class TranscriptionProcessor:
     """Processor class for handling audio file transcriptions using Whisper."""
     
-    def __init__(self, model_name="tiny", device=None, progress_queue=None, output_format="txt"):
+    def __init__(self, model_name="tiny", device=None, progress_queue=None, output_format="txt",
+                 backend="openai-whisper", batch_size=None, compile_model=False,
+                 cache_language=False, preload_cpu_model=False):
         """
         Initialize the transcription processor.
         
@@ -24,13 +253,42 @@ class TranscriptionProcessor:
             device (str): Device to use ('cuda', 'cpu', or None for auto-detection)
             progress_queue (Queue): Queue for reporting progress
             output_format (str): Output format ('txt', 'srt', 'vtt', 'json')
+            backend (str): Inference backend ('openai-whisper' or 'faster-whisper')
+            batch_size (int): Decode VAD speech chunks in batches of this size
+                (openai-whisper only; None for Whisper's sequential sliding window)
+            compile_model (bool): Compile the encoder and decoder with torch.compile
+                (openai-whisper on CUDA only; adds a one-time compile cost at load)
+            cache_language (bool): Detect the language once per directory and reuse it
+                for the other files in that directory
+            preload_cpu_model (bool): Load a CPU copy of the model in the background after
+                a CUDA load, so falling back to CPU after a CUDA error does not stall
         """
+        if backend not in ("openai-whisper", "faster-whisper"):
+            raise ValueError(f"Unsupported backend: {backend}")
+            
         self.model_name = model_name
+        self.backend = backend
         self.requested_device = device
         self.device = self._determine_device(device)
         self.progress_queue = progress_queue
         self.output_format = output_format
+        self._suffix = f".{output_format}"
+        # Subtitle writers are stateless, so one instance serves every file
+        self._writer = get_writer(output_format, output_dir="") if output_format in ("srt", "vtt") else None
+        self.batch_size = batch_size
+        self.compile_model = compile_model
+        self.cache_language = cache_language
+        self._lang_cache: Dict[Path, str] = {}
         self.model = None
+        self._vad_model = None
+        self._mel_host = None
+        self._mel_dev = None
+        self.preload_cpu_model = preload_cpu_model
+        self._cpu_model = None
+        self._cpu_model_event = threading.Event()
+        self._language_codes_by_token = None
+        self._mel_scratch = None
+        self._decoding_tasks: Dict[Tuple[str, bool], DecodingTask] = {}
         
     def _determine_device(self, device):
         """
@@ -72,20 +330,114 @@ class TranscriptionProcessor:
             logger.warning(f"Error during CUDA detection: {e}. Using CPU instead.")
             return "cpu"
     
+    def _create_model(self, device):
+        """
+        Instantiate the model for the configured backend.
+        
+        Args:
+            device (str): Device to load the model on ('cuda' or 'cpu')
+            
+        Returns:
+            The loaded model object
+        """
+        key = (self.backend, self.model_name, device)
+        if key in _MODEL_CACHE:
+            logger.info(f"Reusing already loaded {self.model_name} model on {device}.")
+            return _MODEL_CACHE[key]
+            
+        if self.backend == "faster-whisper":
+            # CTranslate2 backend with quantized weights (INT8 GEMMs on both CPU and GPU)
+            from faster_whisper import WhisperModel
+            compute_type = "int8_float16" if device == "cuda" else "int8"
+            model = WhisperModel(self.model_name, device=device, compute_type=compute_type)
+        else:
+            model = self._load_whisper_checkpoint(device)
+            
+        _MODEL_CACHE[key] = model
+        return model
+    
+    def _load_whisper_checkpoint(self, device):
+        """
+        Load an openai-whisper model, preferring a memory-mapped pre-converted checkpoint.
+        
+        Args:
+            device (str): Device to load the model on ('cuda' or 'cpu')
+            
+        Returns:
+            The loaded Whisper model
+        """
+        # Weights are stored in the dtype they are used in, so no conversion is needed on load
+        dtype = torch.float16 if device == "cuda" else torch.float32
+        checkpoint_path = (CHECKPOINT_CACHE_DIR /
+                           f"{self.model_name}-{str(dtype).split('.')[-1]}-v{CHECKPOINT_FORMAT_VERSION}.pt")
+        
+        if checkpoint_path.exists():
+            try:
+                if _TORCH_MMAP_LOAD:
+                    # mmap=True pages weights in lazily and shares the page cache across runs
+                    checkpoint = torch.load(checkpoint_path, map_location="cpu", mmap=True, weights_only=True)
+                    model = whisper.model.Whisper(whisper.model.ModelDimensions(**checkpoint["dims"]))
+                    model.load_state_dict(checkpoint["model_state_dict"], assign=True)
+                else:
+                    # Without assign, load_state_dict copies into the existing parameters,
+                    # so convert the model to the checkpoint's dtypes first
+                    checkpoint = torch.load(checkpoint_path, map_location="cpu", weights_only=True)
+                    model = whisper.model.Whisper(whisper.model.ModelDimensions(**checkpoint["dims"]))
+                    if dtype == torch.float16:
+                        model = _half_except_layer_norms(model)
+                    model.load_state_dict(checkpoint["model_state_dict"])
+                if self.model_name in whisper._ALIGNMENT_HEADS:
+                    model.set_alignment_heads(whisper._ALIGNMENT_HEADS[self.model_name])
+                return model.to(device)
+            except Exception as e:
+                logger.warning(f"Could not load cached checkpoint {checkpoint_path}: {e}")
+        
+        model = whisper.load_model(self.model_name, device=device)
+        
+        # Convert the weights once here rather than casting them on every forward pass
+        if device == "cuda":
+            model = _half_except_layer_norms(model)
+            
+        try:
+            CHECKPOINT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            torch.save(
+                {"dims": dataclasses.asdict(model.dims), "model_state_dict": model.state_dict()},
+                checkpoint_path,
+            )
+            logger.info(f"Saved converted checkpoint to {checkpoint_path}")
+        except Exception as e:
+            logger.warning(f"Could not save checkpoint cache {checkpoint_path}: {e}")
+            
+        return model
+    
     def load_model(self):
         """Load the Whisper model."""
         if self.model:
             return
             
-        logger.info(f"Loading Whisper {self.model_name} model...")
+        logger.info(f"Loading Whisper {self.model_name} model ({self.backend})...")
         start_time = time.time()
         
         try:
             # Try loading with requested device
-            self.model = whisper.load_model(self.model_name, device=self.device)
+            self.model = self._create_model(self.device)
             load_time = time.time() - start_time
             logger.info(f"Model loaded on {self.device} in {load_time:.2f} seconds.")
             
+            if self.backend == "openai-whisper" and self.device == "cuda":
+                # Reusable pinned host / device buffers for the language-detection mel
+                mel_shape = (self.model.dims.n_mels, whisper.audio.N_FRAMES)
+                self._mel_host = torch.empty(mel_shape, dtype=torch.float16, pin_memory=True)
+                self._mel_dev = torch.empty_like(self._mel_host, device=self.device)
+                
+                if self.compile_model:
+                    self._compile_model()
+                else:
+                    self._enable_cuda_graphs()
+                    
+            if self.device == "cuda" and self.preload_cpu_model:
+                threading.Thread(target=self._preload_cpu_model, name="cpu-model-preload", daemon=True).start()
+            
         except Exception as e:
             # If loading on GPU failed and it wasn't explicitly CPU only, try CPU
             if self.device == "cuda" and self.requested_device != "cpu":
@@ -95,7 +447,7 @@ class TranscriptionProcessor:
                 try:
                     # Update device to CPU
                     self.device = "cpu"
-                    self.model = whisper.load_model(self.model_name, device="cpu")
+                    self.model = self._create_model("cpu")
                     load_time = time.time() - start_time
                     logger.info(f"Model loaded on CPU in {load_time:.2f} seconds.")
                     
@@ -107,6 +459,110 @@ class TranscriptionProcessor:
                 logger.error(f"Failed to load model: {e}")
                 raise
     
+    def _preload_cpu_model(self):
+        """Load the CPU fallback model (runs on a background thread)."""
+        try:
+            self._cpu_model = self._create_model("cpu")
+            logger.info("CPU fallback model preloaded.")
+        except Exception as e:
+            logger.warning(f"Could not preload CPU fallback model: {e}")
+        finally:
+            self._cpu_model_event.set()
+    
+    def _fall_back_to_cpu(self):
+        """Switch the processor to CPU, using the preloaded CPU model when there is one."""
+        if self.device == "cpu":
+            return
+            
+        self.device = "cpu"
+        if self.preload_cpu_model:
+            self._cpu_model_event.wait()
+            
+        if self._cpu_model is not None:
+            logger.info("Switching to preloaded CPU model...")
+            self.model = self._cpu_model
+        else:
+            logger.info("Reloading model on CPU...")
+            self.model = self._create_model("cpu")
+        
+        # Cached decoding tasks are bound to the GPU model
+        self._decoding_tasks.clear()
+            
+        # Release the GPU allocations of the failed run
+        torch.cuda.empty_cache()
+    
+    def _enable_cuda_graphs(self):
+        """Replay the fixed-shape audio encoder from CUDA graphs to cut launch overhead."""
+        # Models reused from _MODEL_CACHE are already wrapped
+        if isinstance(self.model.encoder, _CUDAGraphEncoder):
+            return
+            
+        try:
+            self.model.encoder = _CUDAGraphEncoder(self.model.encoder)
+            
+            # Capture the fp16 graph used by transcribe() up front so the first file is not slower
+            dummy_mel = torch.zeros((1, self.model.dims.n_mels, 3000), dtype=torch.float16, device=self.device)
+            self.model.encoder(dummy_mel)
+            logger.info("Captured CUDA graph for the audio encoder.")
+            
+        except Exception as e:
+            # Graph capture is an optimization only; fall back to eager execution
+            logger.warning(f"CUDA graph capture failed, using eager encoder: {e}")
+            if isinstance(self.model.encoder, _CUDAGraphEncoder):
+                self.model.encoder = self.model.encoder.encoder
+    
+    def _compile_model(self):
+        """Compile the encoder and decoder with torch.compile and warm them up."""
+        # Models reused from _MODEL_CACHE are already compiled
+        if getattr(self.model, "_whisper_batch_compiled", False):
+            return
+            
+        encoder, decoder = self.model.encoder, self.model.decoder
+        try:
+            # reduce-overhead fuses pointwise ops and replays the result from CUDA graphs
+            self.model.encoder = torch.compile(encoder, mode="reduce-overhead", fullgraph=True)
+            # The kv-cache hooks and growing token sequence rule out fullgraph for the decoder
+            self.model.decoder = torch.compile(decoder, mode="reduce-overhead", dynamic=True)
+            
+            # Pay the compilation cost here instead of on the first file
+            logger.info("Compiling Whisper encoder/decoder (one-time warmup)...")
+            start_time = time.time()
+            with torch.inference_mode():
+                self.model.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32), fp16=True, language="en")
+            logger.info(f"Model compiled in {time.time() - start_time:.2f} seconds.")
+            
+            self.model._whisper_batch_compiled = True
+            
+        except Exception as e:
+            # Compilation is an optimization only; fall back to eager execution
+            logger.warning(f"torch.compile failed, using eager model: {e}")
+            self.model.encoder, self.model.decoder = encoder, decoder
+    
+    def _iter_inputs(self, files):
+        """
+        Yield (file, audio, mel) tuples, decoding audio ahead of the model when possible.
+        
+        Args:
+            files (list): List of Path objects for audio files
+        """
+        # faster-whisper decodes internally, so there is nothing to prefetch
+        if self.backend == "faster-whisper" or not files:
+            for file in files:
+                yield file, None, None
+            return
+            
+        num_workers = min(len(files), max(1, (os.cpu_count() or 2) // 2))
+        loader = DataLoader(
+            AudioDataset(files, n_mels=self.model.dims.n_mels),
+            batch_size=None,
+            collate_fn=_collate_single,
+            num_workers=num_workers,
+            pin_memory=(self.device == "cuda"),
+            prefetch_factor=2,
+        )
+        for index, audio, mel in loader:
+            yield files[index], audio, mel
+    
     def process_files(self, files):
         """
         Process a list of audio files for transcription.
@@ -114,6 +570,17 @@ class TranscriptionProcessor:
         Args:
             files (list): List of Path objects for audio files
         """
+        # Drop files that already have a transcript so a resumed batch with nothing
+        # left to do never pays for loading the model
+        pending = [file for file in files if not file.with_suffix(self._suffix).exists()]
+        if len(pending) < len(files):
+            logger.info(f"Skipping {len(files) - len(pending)} file(s) with existing transcripts.")
+        if not pending:
+            if self.progress_queue:
+                self.progress_queue.put(("complete", None))
+            return
+        files = pending
+        
         # Load the model
         try:
             self.load_model()
@@ -126,70 +593,156 @@ class TranscriptionProcessor:
         # Process files
         total_files = len(files)
         
-        for i, file in enumerate(files, 1):
-            # Report progress
-            if self.progress_queue:
-                self.progress_queue.put((i, total_files, file.name))
+        # Transcripts are written on background threads so the next file can start immediately
+        io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="transcript-writer")
+        pending_writes = []
+        
+        try:
+            # Decode upcoming files on worker processes while the current one is transcribed
+            for i, (file, audio, mel) in enumerate(self._iter_inputs(files), 1):
+                # Report progress
+                if self.progress_queue:
+                    self.progress_queue.put((i, total_files, file.name))
             
-            logger.info(f"Processing {i}/{total_files}: {file.name}")
+                logger.info(f"Processing {i}/{total_files}: {file.name}")
             
-            try:
-                self._process_single_file(file)
+                try:
+                    result = self._process_single_file(file, audio, mel)
+                    if result is not None:
+                        pending_writes.append(io_pool.submit(self._save_transcription, file, result))
                 
-            except Exception as e:
-                error_msg = str(e)
-                logger.error(f"Error processing {file.name}: {error_msg}")
+                except Exception as e:
+                    error_msg = str(e)
+                    logger.error(f"Error processing {file.name}: {error_msg}")
                 
-                # Check if this is a CUDA error and we're not already on CPU
-                if self.device == "cuda" and any(cuda_term in error_msg.lower() for cuda_term in 
-                                               ["cuda", "cudnn", "gpu", "nvrtc", "cublas"]):
-                    logger.warning(f"CUDA error detected. Attempting to fall back to CPU for {file.name}")
+                    # Check if this is a CUDA error and we're not already on CPU
+                    if self.device == "cuda" and _CUDA_ERR_RE.search(error_msg):
+                        logger.warning(f"CUDA error detected. Attempting to fall back to CPU for {file.name}")
                     
-                    try:
-                        # Switch to CPU for this file
-                        old_device = self.device
-                        self.device = "cpu"
+                        try:
+                            # Switch to CPU for this and all remaining files
+                            self._fall_back_to_cpu()
                         
-                        # If needed, reload model on CPU
-                        if self.model and hasattr(self.model, "device") and str(self.model.device) != "cpu":
-                            logger.info("Reloading model on CPU...")
-                            self.model = whisper.load_model(self.model_name, device="cpu")
+                            # Retry processing
+                            logger.info(f"Retrying {file.name} on CPU")
+                            result = self._process_single_file(file, audio, mel)
+                            if result is not None:
+                                pending_writes.append(io_pool.submit(self._save_transcription, file, result))
                         
-                        # Retry processing
-                        logger.info(f"Retrying {file.name} on CPU")
-                        self._process_single_file(file)
+                            # Keep using CPU for remaining files if GPU failed
+                            logger.info("Continuing with CPU for remaining files")
                         
-                        # Keep using CPU for remaining files if GPU failed
-                        logger.info("Continuing with CPU for remaining files")
-                        
-                    except Exception as cpu_error:
-                        logger.error(f"CPU fallback also failed for {file.name}: {cpu_error}")
+                        except Exception as cpu_error:
+                            logger.error(f"CPU fallback also failed for {file.name}: {cpu_error}")
+                            if self.progress_queue:
+                                self.progress_queue.put(("error", f"Transcription failed on both GPU and CPU: {cpu_error}"))
+                            return
+                    else:
+                        # Not a CUDA error or already on CPU, so report and continue
                         if self.progress_queue:
-                            self.progress_queue.put(("error", f"Transcription failed on both GPU and CPU: {cpu_error}"))
+                            self.progress_queue.put(("error", f"Error processing {file.name}: {error_msg}"))
                         return
-                else:
-                    # Not a CUDA error or already on CPU, so report and continue
-                    if self.progress_queue:
-                        self.progress_queue.put(("error", f"Error processing {file.name}: {error_msg}"))
-                    return
+        finally:
+            # Wait for pending transcripts to be written
+            io_pool.shutdown(wait=True)
+            
+        for future in pending_writes:
+            if future.exception() is not None:
+                error = future.exception()
+                logger.error(f"Failed to save transcription: {error}")
+                if self.progress_queue:
+                    self.progress_queue.put(("error", f"Failed to save transcription: {error}"))
+                return
         
         # Report completion
         if self.progress_queue:
             self.progress_queue.put(("complete", None))
             
-    def _process_single_file(self, file):
+    def process_files_parallel(self, files, workers):
+        """
+        Shard files across worker processes, each with its own model.
+        
+        Workers are bound round-robin to the visible GPUs, or share the CPU cores
+        when running on CPU.
+        
+        Args:
+            files (list): List of Path objects for audio files
+            workers (int): Number of worker processes
+        """
+        workers = max(1, min(workers, len(files)))
+        if workers == 1:
+            return self.process_files(files)
+            
+        if self.device == "cuda":
+            devices = [f"cuda:{rank % torch.cuda.device_count()}" for rank in range(workers)]
+        else:
+            devices = ["cpu"] * workers
+        shards = [files[rank::workers] for rank in range(workers)]
+        processor_kwargs = {
+            "model_name": self.model_name,
+            "output_format": self.output_format,
+            "backend": self.backend,
+            "batch_size": self.batch_size,
+            "compile_model": self.compile_model,
+            "cache_language": self.cache_language,
+        }
+        
+        logger.info(f"Processing {len(files)} files on {workers} workers: {', '.join(devices)}")
+        events = mp.get_context("spawn").Queue()
+        context = mp.spawn(_worker_entry, args=(shards, devices, processor_kwargs, events),
+                           nprocs=workers, join=False)
+        
+        # Merge the per-worker progress into a single count for progress_queue
+        done = 0
+        finished = 0
+        failed = False
+        while finished < workers:
+            try:
+                rank, event = events.get(timeout=0.5)
+            except Empty:
+                # Raises if a worker died without reporting
+                context.join(timeout=0)
+                continue
+                
+            if event[0] == "complete":
+                finished += 1
+            elif event[0] == "error":
+                finished += 1
+                failed = True
+                logger.error(f"Worker {rank} failed: {event[1]}")
+                if self.progress_queue:
+                    self.progress_queue.put(event)
+            else:
+                done += 1
+                if self.progress_queue:
+                    self.progress_queue.put((done, len(files), event[2]))
+                    
+        while not context.join():
+            pass
+            
+        # A failed worker has already been reported as an "error" event
+        if self.progress_queue and not failed:
+            self.progress_queue.put(("complete", None))
+    
+    def _process_single_file(self, file, audio=None, mel=None):
         """
         Process a single audio file.
         
         Args:
             file (Path): Path object for the audio file
+            audio (Tensor): Optional pre-decoded audio samples
+            mel (Tensor): Optional pre-computed mel of the first 30s window
+            
+        Returns:
+            dict: Whisper transcription result to save, or None if there is nothing
+                left to save (skipped, or already streamed to disk)
         """
         # Check if file exists
         if not file.exists():
             raise FileNotFoundError(f"Audio file not found: {file}")
             
         # Check if output file already exists
-        output_path = file.with_suffix(f".{self.output_format}")
+        output_path = file.with_suffix(self._suffix)
         if output_path.exists():
             logger.info(f"Output file already exists: {output_path}. Skipping.")
             return
@@ -199,35 +752,318 @@ class TranscriptionProcessor:
             logger.info(f"Transcribing {file} using {self.device}...")
             start_time = time.time()
             
-            # Load audio and pad/trim it
-            audio = whisper.load_audio(str(file))
-            audio = whisper.pad_or_trim(audio)
-            
-            # Make log-Mel spectrogram and move to the same device as the model
-            mel = whisper.log_mel_spectrogram(audio).to(self.device)
+            if self.backend == "faster-whisper":
+                # faster-whisper decodes the audio, detects the language and runs VAD internally
+                segments, info = self.model.transcribe(str(file), beam_size=5, vad_filter=True)
+                logger.info(f"Detected language: {info.language}")
+                
+                # segments is lazy: decoding happens while it is written out
+                self._stream_segments(file, segments, info)
+                
+                elapsed_time = time.time() - start_time
+                logger.info(f"Transcription complete in {elapsed_time:.2f} seconds.")
+                return None
             
-            # Detect the spoken language
-            _, probs = self.model.detect_language(mel)
-            detected_language = max(probs, key=probs.get)
-            logger.info(f"Detected language: {detected_language}")
+            if audio is None:
+                # Decode the audio once; the same array is reused for transcription
+                audio = _decode_audio(file)
+                
+                # Make log-Mel spectrogram of the first 30s window for language detection
+                mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(audio[:30 * SAMPLE_RATE]),
+                                                  n_mels=self.model.dims.n_mels)
             
-            # Decode the audio
-            options = {
-                "fp16": self.device == "cuda"
-            }
-            result = self.model.transcribe(str(file), **options)
+            # Files that fit in one window are decoded straight from the encoder output
+            single_window = not self.batch_size and len(audio) <= whisper.audio.N_SAMPLES
             
-            # Save the transcription
-            self._save_transcription(file, result)
+            with torch.inference_mode():
+                detected_language = self._lang_cache.get(file.parent) if self.cache_language else None
+                
+                audio_features = None
+                if detected_language is None or single_window:
+                    # Encode the first window once; language detection and the
+                    # single-window decode both take the encoder output
+                    audio_features = self.model.embed_audio(self._stage_mel(mel).unsqueeze(0))
+                    
+                if detected_language is None:
+                    # Detect the spoken language; detect_language already takes the argmax
+                    # over the language logits, so map the winning token straight to its code
+                    language_tokens, _ = self.model.detect_language(audio_features)
+                    detected_language = self._language_codes()[int(language_tokens[0])]
+                    logger.info(f"Detected language: {detected_language}")
+                    
+                    if self.cache_language:
+                        self._lang_cache[file.parent] = detected_language
+                else:
+                    logger.info(f"Using cached language for {file.parent}: {detected_language}")
+                
+                # Decode the audio, passing the array so Whisper skips re-loading the file
+                # and the detected language so it skips its own detection pass.
+                # fp16 matches the weight dtype chosen in _create_model.
+                result = None
+                if self.batch_size:
+                    result = self._transcribe_vad_batched(audio, detected_language)
+                elif single_window:
+                    result = self._decode_single_window(audio_features, detected_language,
+                                                        len(audio) / SAMPLE_RATE)
+                    
+                if result is None:
+                    options = {
+                        "fp16": self.device == "cuda",
+                        "language": detected_language
+                    }
+                    result = self.model.transcribe(audio, **options)
             
-            # Log completion
+            # Log completion; the caller saves the transcription
             elapsed_time = time.time() - start_time
             logger.info(f"Transcription complete in {elapsed_time:.2f} seconds.")
+            return result
             
         except Exception as e:
             logger.error(f"Error transcribing {file}: {e}")
             raise
     
+    def _decode_single_window(self, audio_features, language, duration):
+        """
+        Decode a file that fits in one 30s window from its encoder output.
+        
+        Args:
+            audio_features (Tensor): Encoder output of shape (1, n_audio_ctx, n_audio_state)
+            language (str): Language code to decode with
+            duration (float): Length of the audio in seconds
+            
+        Returns:
+            dict: Whisper-style result, or None if the decode should be retried
+                through transcribe() and its temperature fallback
+        """
+        task = self._decoding_task(language)
+        decoded = task.run(audio_features)[0]
+        
+        # Same thresholds transcribe() uses to decide on a higher-temperature retry
+        if decoded.compression_ratio > 2.4 or decoded.avg_logprob < -1.0:
+            return None
+            
+        tokenizer = task.tokenizer
+        
+        # Split the token stream into segments at each <|t0|> text <|t1|> pair
+        segments = []
+        start, text_tokens = None, []
+        for token in decoded.tokens + [None]:
+            if token is not None and token < tokenizer.timestamp_begin:
+                text_tokens.append(token)
+                continue
+                
+            timestamp = duration if token is None else (token - tokenizer.timestamp_begin) * 0.02
+            if text_tokens:
+                segments.append({
+                    "id": len(segments),
+                    "seek": 0,
+                    "start": start or 0.0,
+                    "end": min(timestamp, duration),
+                    "text": tokenizer.decode(text_tokens),
+                    "tokens": text_tokens,
+                    "temperature": decoded.temperature,
+                    "avg_logprob": decoded.avg_logprob,
+                    "compression_ratio": decoded.compression_ratio,
+                    "no_speech_prob": decoded.no_speech_prob,
+                })
+                start, text_tokens = None, []
+            else:
+                start = timestamp
+                
+        return {
+            "text": decoded.text,
+            "segments": segments,
+            "language": language,
+        }
+    
+    def _decoding_task(self, language, without_timestamps=False):
+        """
+        Return the DecodingTask for a language, building it on first use.
+        
+        A DecodingTask precomputes its tokenizer, suppressed tokens and logit filters
+        and can be run repeatedly, so one instance serves every window decoded in
+        that language instead of whisper.decode() rebuilding it per call.
+        
+        Args:
+            language (str): Language code to decode with
+            without_timestamps (bool): Decode text tokens only
+            
+        Returns:
+            DecodingTask: Task bound to the current model
+        """
+        key = (language, without_timestamps)
+        if key not in self._decoding_tasks:
+            options = whisper.DecodingOptions(
+                language=language,
+                without_timestamps=without_timestamps,
+                fp16=self.device == "cuda",
+            )
+            self._decoding_tasks[key] = DecodingTask(self.model, options)
+        return self._decoding_tasks[key]
+    
+    def _language_codes(self):
+        """
+        Map language token ids to language codes for the loaded model.
+        
+        Returns:
+            dict: Language code for each language token id
+        """
+        if self._language_codes_by_token is None:
+            if hasattr(self.model, "num_languages"):
+                tokenizer = whisper.tokenizer.get_tokenizer(self.model.is_multilingual,
+                                                            num_languages=self.model.num_languages)
+            else:
+                # openai-whisper before 20231106 has a fixed language list
+                tokenizer = whisper.tokenizer.get_tokenizer(self.model.is_multilingual)
+            self._language_codes_by_token = dict(zip(tokenizer.all_language_tokens, tokenizer.all_language_codes))
+        return self._language_codes_by_token
+    
+    def _stage_mel(self, mel):
+        """
+        Move the language-detection mel to the device in the model's dtype.
+        
+        On CUDA the mel goes through the pinned staging buffer allocated in load_model,
+        so the host-to-device copy is asynchronous and no new buffers are allocated per file.
+        
+        Args:
+            mel (Tensor): Mel spectrogram of the first 30s window on the CPU
+            
+        Returns:
+            Tensor: The mel on self.device
+        """
+        if self.device != "cuda" or self._mel_host is None or self._mel_host.shape != mel.shape:
+            dtype = torch.float16 if self.device == "cuda" else torch.float32
+            return mel.to(self.device, dtype=dtype, non_blocking=True)
+            
+        self._mel_host.copy_(mel)
+        self._mel_dev.copy_(self._mel_host, non_blocking=True)
+        return self._mel_dev
+    
+    def _speech_chunks(self, audio):
+        """
+        Find speech regions with Silero VAD and pack them into chunks of at most 30s.
+        
+        Args:
+            audio (Tensor): Mono float32 samples at 16 kHz
+            
+        Returns:
+            list: [start, end] sample offsets for each chunk
+        """
+        from silero_vad import load_silero_vad, get_speech_timestamps
+        
+        if self._vad_model is None:
+            self._vad_model = load_silero_vad()
+            
+        chunk_samples = whisper.audio.N_SAMPLES
+        chunks = []
+        for region in get_speech_timestamps(audio, self._vad_model, sampling_rate=SAMPLE_RATE):
+            start, end = region["start"], region["end"]
+            
+            # Merge with the previous chunk while the result still fits in one window
+            if chunks and end - chunks[-1][0] <= chunk_samples:
+                chunks[-1][1] = end
+                continue
+                
+            # Split speech regions longer than one window
+            while end - start > chunk_samples:
+                chunks.append([start, start + chunk_samples])
+                start += chunk_samples
+            chunks.append([start, end])
+            
+        return chunks
+    
+    def _transcribe_vad_batched(self, audio, language):
+        """
+        Transcribe only the speech regions, decoding up to batch_size windows per forward pass.
+        
+        Args:
+            audio: Mono float32 samples at 16 kHz (ndarray or Tensor)
+            language (str): Language code to decode with
+            
+        Returns:
+            dict: Whisper-style result with 'text', 'segments' and 'language' keys
+        """
+        audio = torch.as_tensor(audio)
+        chunks = self._speech_chunks(audio)
+        
+        dtype = torch.float16 if self.device == "cuda" else torch.float32
+        task = self._decoding_task(language, without_timestamps=True)
+        
+        # The batch mel buffer is allocated once and refilled in place for every batch and file
+        scratch_shape = (self.batch_size, self.model.dims.n_mels, whisper.audio.N_FRAMES)
+        if self._mel_scratch is None or self._mel_scratch.device.type != self.device:
+            self._mel_scratch = torch.empty(scratch_shape, dtype=torch.float32, device=self.device)
+        
+        segments = []
+        for batch_start in range(0, len(chunks), self.batch_size):
+            batch = chunks[batch_start:batch_start + self.batch_size]
+            for row, (start, end) in enumerate(batch):
+                window = whisper.pad_or_trim(audio[start:end]).to(self.device, non_blocking=True)
+                _log_mel_into(window, self._mel_scratch[row])
+            mel_batch = self._mel_scratch[:len(batch)].to(dtype)
+            
+            for (start, end), decoded in zip(batch, task.run(mel_batch)):
+                segments.append({
+                    "id": len(segments),
+                    "start": start / SAMPLE_RATE,
+                    "end": end / SAMPLE_RATE,
+                    "text": decoded.text,
+                })
+                
+        return {
+            "text": " ".join(segment["text"].strip() for segment in segments),
+            "segments": segments,
+            "language": language,
+        }
+    
+    def _stream_segments(self, file, segments, info):
+        """
+        Write faster-whisper segments to the output file as they are decoded.
+        
+        Args:
+            file (Path): Path object for the audio file
+            segments: Segment generator returned by faster-whisper
+            info: TranscriptionInfo returned by faster-whisper
+        """
+        output_format = self.output_format
+        output_path = file.with_suffix(self._suffix)
+        if output_format not in ("txt", "srt", "vtt", "json"):
+            logger.warning(f"Unsupported output format: {output_format}. Using txt instead.")
+            output_format = "txt"
+            output_path = file.with_suffix(".txt")
+            
+        # Write to a temporary file so an interrupted run does not leave a partial transcript behind
+        part_path = output_path.with_name(output_path.name + ".part")
+        texts = []
+        
+        with open(part_path, "w", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE) as f:
+            if output_format == "vtt":
+                f.write("WEBVTT\n\n")
+            elif output_format == "json":
+                f.write('{"language": %s, "segments": [' % json.dumps(info.language))
+                
+            for i, segment in enumerate(segments):
+                if output_format == "txt":
+                    f.write(segment.text)
+                    
+                elif output_format == "json":
+                    texts.append(segment.text)
+                    record = {"id": segment.id, "start": segment.start, "end": segment.end, "text": segment.text}
+                    f.write(("," if i else "") + json.dumps(record, ensure_ascii=False))
+                    
+                else:
+                    decimal_marker = "," if output_format == "srt" else "."
+                    start = format_timestamp(segment.start, always_include_hours=True, decimal_marker=decimal_marker)
+                    end = format_timestamp(segment.end, always_include_hours=True, decimal_marker=decimal_marker)
+                    index = f"{i + 1}\n" if output_format == "srt" else ""
+                    f.write(f"{index}{start} --> {end}\n{segment.text.strip()}\n\n")
+                    
+            if output_format == "json":
+                f.write('], "text": %s}' % json.dumps("".join(texts), ensure_ascii=False))
+                
+        os.replace(part_path, output_path)
+        logger.info(f"Saved transcription to {output_path}")
+    
     def _save_transcription(self, file, result):
         """
         Save the transcription results to a file.
@@ -237,26 +1073,29 @@ class TranscriptionProcessor:
             result (dict): Whisper transcription result
         """
         # Determine the output file path based on the original file path
-        output_path = file.with_suffix(f".{self.output_format}")
+        output_path = file.with_suffix(self._suffix)
         
         # Save in the requested format
         if self.output_format == "txt":
-            with open(output_path, "w", encoding="utf-8") as f:
+            with open(output_path, "w", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE) as f:
                 f.write(result["text"])
                 
         elif self.output_format == "json":
-            import json
-            with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(result, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                # orjson serializes straight to UTF-8 bytes several times faster than json
+                with open(output_path, "wb") as f:
+                    f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+            else:
+                with open(output_path, "w", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE) as f:
+                    json.dump(result, f, indent=2, ensure_ascii=False)
                 
-        elif self.output_format in ["srt", "vtt"]:
-            from whisper.utils import get_writer
-            writer = get_writer(self.output_format, output_dir=file.parent)
-            writer(result, file.stem)
+        elif self._writer is not None:
+            with open(output_path, "w", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE) as f:
+                self._writer.write_result(result, file=f)
             
         else:
             logger.warning(f"Unsupported output format: {self.output_format}. Using txt instead.")
-            with open(file.with_suffix(".txt"), "w", encoding="utf-8") as f:
+            with open(file.with_suffix(".txt"), "w", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE) as f:
                 f.write(result["text"])
                 
         logger.info(f"Saved transcription to {output_path}") 
\ No newline at end of file
@@ -6,20 +6,27 @@ Modern Windows 11 style GUI for WhisperBatch using QtPy with PyQt6 backend.
 
 import sys
 import os
-import threading
+import atexit
+import functools
+import shutil
+import tempfile
+import time
 import queue
 import logging
 from pathlib import Path
 
 # Ensure the src directory is in the Python path
 project_root = Path(__file__).resolve().parent.parent.parent
-sys.path.insert(0, str(project_root / 'src'))
+src_path = str(project_root / 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
 
 try:
     from qtpy import QtWidgets, QtCore, QtGui
     from whisper_batch import DEFAULT_LOG_FORMAT
     import whisper_batch.file_handler as file_handler
-    from whisper_batch.main import process_videos
+    # whisper_batch.main (and with it torch/whisper) is imported by TranscriptionWorker.run
+    # so the window can appear before the heavy modules are loaded
 except ImportError as e:
     print(f"Error importing modules: {e}")
     print("Ensure you are running from the project root and have installed all requirements.")
@@ -30,16 +37,32 @@ logging.basicConfig(level=logging.INFO, format=DEFAULT_LOG_FORMAT)
 logger = logging.getLogger("gui")
 
 # List of available Whisper models
-AVAILABLE_MODELS = [
+AVAILABLE_MODELS = (
     "tiny", "tiny.en", 
     "base", "base.en", 
     "small", "small.en",
     "medium", "medium.en",
     "large", "large-v3"
-]
+)
+
+# Status keywords reported through the progress callback, in match order, with the
+# detail progress signal and value each one sets
+PROGRESS_STAGES = (
+    ("loading model", "model_loading_progress", 50),
+    ("detecting files", "file_detection_progress", 50),
+    ("transcribing", "current_file_progress", 75),  # Transcription stage
+    ("processing", "current_file_progress", 25),  # Initial file processing
+    ("complete", "current_file_progress", 100),  # File completed
+)
+
+# Compute types offered for decoding. The GUI runs the openai-whisper backend,
+# which has no int8 kernels; int8 would switch to faster-whisper (a different
+# model download), so it is left to the CLI's --backend/--compute-type.
+# auto picks float16 on the GPU and float32 on the CPU.
+COMPUTE_TYPES = ("auto", "float32", "float16")
 
 # List of languages
-LANGUAGES = [
+LANGUAGES = (
     ("Auto Detect", None),
     ("English", "en"),
     ("Spanish", "es"),
@@ -52,7 +75,297 @@ LANGUAGES = [
     ("Portuguese", "pt"),
     ("Arabic", "ar"),
     # Add more languages as needed
-]
+)
+
+# Display names in combo order, and display name -> language code
+LANGUAGE_NAMES = tuple(name for name, _ in LANGUAGES)
+LANGUAGE_CODES = dict(LANGUAGES)
+
+# Indicator images used by the stylesheet (written to disk once, see _style_sheet)
+STYLE_IMAGES = {
+    "combo_arrow": '<svg xmlns="http://www.w3.org/2000/svg" width="10" height="6" viewBox="0 0 10 6"><path fill="#404040" d="M0 0l5 5 5-5z"/></svg>',
+    "check_mark": '<svg xmlns="http://www.w3.org/2000/svg" width="10" height="8" viewBox="0 0 10 8"><path fill="#ffffff" d="M8 0L3.5 4.5 2 3l-2 2 3.5 3.5L10 2l-2-2z"/></svg>',
+    "radio_dot": '<svg xmlns="http://www.w3.org/2000/svg" width="8" height="8" viewBox="0 0 8 8"><circle fill="#0078d4" cx="4" cy="4" r="4"/></svg>',
+}
+
+# Modern Windows 11 style with rounded corners and Mica-like effects.
+# @name@ placeholders are replaced with url() references to STYLE_IMAGES.
+WIN11_STYLE_SHEET = """
+    QMainWindow {
+        background-color: #f8f8f8;
+    }
+    QWidget {
+        font-family: 'Segoe UI', sans-serif;
+        font-size: 10pt;
+    }
+    QGroupBox {
+        font-weight: bold;
+        font-size: 11pt;
+        border: 1px solid #d0d0d0;
+        border-radius: 8px;
+        margin-top: 2.5ex;
+        padding: 15px;
+        background-color: #ffffff;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 10px;
+        background-color: #ffffff;
+        color: #0078d4;
+    }
+    QPushButton {
+        background-color: #f0f0f0;
+        border: 1px solid #d8d8d8;
+        border-radius: 4px;
+        padding: 5px 15px;
+        color: #202020;
+        font-weight: normal;
+    }
+    QPushButton:hover {
+        background-color: #e8e8e8;
+        border: 1px solid #c8c8c8;
+    }
+    QPushButton:pressed {
+        background-color: #d8d8d8;
+    }
+    QPushButton:disabled {
+        color: #a0a0a0;
+        background-color: #f5f5f5;
+        border: 1px solid #e0e0e0;
+    }
+    #start_button {
+        background-color: #0078d4;
+        color: white;
+        font-weight: bold;
+        border: none;
+    }
+    #start_button:hover {
+        background-color: #006cbe;
+    }
+    #start_button:pressed {
+        background-color: #005ca3;
+    }
+    QComboBox {
+        border: 1px solid #d0d0d0;
+        border-radius: 4px;
+        padding: 2px 8px;
+        background-color: #ffffff;
+        selection-background-color: #0078d4;
+        min-height: 25px;
+        color: #000000;
+        font-size: 10pt;
+    }
+    QLineEdit {
+        border: 1px solid #d0d0d0;
+        border-radius: 4px;
+        padding: 2px 8px;
+        background-color: #ffffff;
+        selection-background-color: #0078d4;
+        min-height: 25px;
+        color: #000000;
+        font-size: 10pt;
+    }
+    QComboBox:focus, QLineEdit:focus {
+        border: 1px solid #0078d4;
+    }
+    QComboBox::drop-down {
+        subcontrol-origin: padding;
+        subcontrol-position: top right;
+        width: 20px;
+        border-left-width: 0px;
+        border-top-right-radius: 4px;
+        border-bottom-right-radius: 4px;
+    }
+    QComboBox::down-arrow {
+        image: @combo_arrow@;
+        width: 10px;
+        height: 6px;
+        margin-right: 8px;
+    }
+    QComboBox QAbstractItemView {
+        border: 1px solid #d0d0d0;
+        selection-background-color: #0078d4;
+        selection-color: #ffffff;
+        background-color: #ffffff;
+        color: #000000;
+    }
+    QProgressBar {
+        border: 1px solid #d0d0d0;
+        border-radius: 4px;
+        text-align: center;
+        background-color: #f5f5f5;
+        height: 16px;
+        font-size: 9pt;
+    }
+    QProgressBar::chunk {
+        background-color: #0078d4;
+        border-radius: 3px;
+    }
+    QLabel {
+        color: #202020;
+        font-weight: normal;
+    }
+    QCheckBox {
+        spacing: 8px;
+        color: #202020;
+        min-height: 22px;
+        margin-left: 0px;
+        padding-left: 0px;
+    }
+    QRadioButton {
+        spacing: 8px;
+        color: #202020;
+        min-height: 22px;
+        min-width: 100px;
+    }
+    QCheckBox::indicator {
+        width: 16px;
+        height: 16px;
+        border: 1px solid #d0d0d0;
+        border-radius: 3px;
+        background-color: #ffffff;
+    }
+    QRadioButton::indicator {
+        width: 16px;
+        height: 16px;
+        border: 1px solid #d0d0d0;
+        border-radius: 9px;
+        background-color: #ffffff;
+    }
+    QCheckBox::indicator:hover, QRadioButton::indicator:hover {
+        border: 1px solid #0078d4;
+    }
+    QCheckBox::indicator:checked {
+        background-color: #0078d4;
+        border: 1px solid #0078d4;
+        image: @check_mark@;
+        padding: 0px;
+    }
+    QRadioButton::indicator:checked {
+        background-color: #ffffff;
+        border: 1px solid #0078d4;
+    }
+    QRadioButton::indicator:checked {
+        image: @radio_dot@;
+        padding: 2px;
+    }
+    QPlainTextEdit {
+        background-color: #ffffff;
+        border: 1px solid #d0d0d0;
+        border-radius: 4px;
+        padding: 5px;
+        selection-background-color: #0078d4;
+        selection-color: #ffffff;
+        color: #000000;
+    }
+    QScrollBar:vertical {
+        border: none;
+        background: #f0f0f0;
+        width: 8px;
+        margin: 0px;
+        border-radius: 4px;
+    }
+    QScrollBar::handle:vertical {
+        background: #c0c0c0;
+        min-height: 20px;
+        border-radius: 4px;
+    }
+    QScrollBar::handle:vertical:hover {
+        background: #a0a0a0;
+    }
+    QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
+        height: 0px;
+    }
+    QScrollBar:horizontal {
+        border: none;
+        background: #f0f0f0;
+        height: 8px;
+        margin: 0px;
+        border-radius: 4px;
+    }
+    QScrollBar::handle:horizontal {
+        background: #c0c0c0;
+        min-width: 20px;
+        border-radius: 4px;
+    }
+    QScrollBar::handle:horizontal:hover {
+        background: #a0a0a0;
+    }
+    QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {
+        width: 0px;
+    }
+"""
+
+@functools.lru_cache(maxsize=None)
+def _style_sheet():
+    """
+    Build the application stylesheet once per process.
+    
+    The indicator images are written to small SVG files instead of being inlined as
+    base64 data URIs, which Qt would otherwise decode again on every style polish.
+    
+    Returns:
+        str: The stylesheet with image placeholders resolved
+    """
+    image_dir = Path(tempfile.mkdtemp(prefix="whisper_batch_style_"))
+    atexit.register(shutil.rmtree, image_dir, ignore_errors=True)
+    
+    style_sheet = WIN11_STYLE_SHEET
+    for name, svg in STYLE_IMAGES.items():
+        image_path = image_dir / f"{name}.svg"
+        image_path.write_text(svg, encoding="utf-8")
+        style_sheet = style_sheet.replace(f"@{name}@", f"url({image_path.as_posix()})")
+    return style_sheet
+
+@functools.lru_cache(maxsize=None)
+def _font(point_size, weight=QtGui.QFont.Weight.Normal):
+    """
+    Return the shared Segoe UI font for a size and weight.
+    
+    Built on first use, after the QApplication exists, so each font is looked up
+    in the system font database once per process.
+    
+    Args:
+        point_size (int): Font size in points
+        weight (QtGui.QFont.Weight): Font weight
+    
+    Returns:
+        QtGui.QFont: The font
+    """
+    return QtGui.QFont("Segoe UI", point_size, weight)
+
+@functools.lru_cache(maxsize=1)
+def _build_app_icon():
+    """
+    Draw the application icon once per process.
+    
+    Returns:
+        QtGui.QIcon: A white "W" on a blue rounded square
+    """
+    # Create a pixmap for the icon
+    icon_size = 64
+    pixmap = QtGui.QPixmap(icon_size, icon_size)
+    pixmap.fill(QtCore.Qt.GlobalColor.transparent)
+    
+    # Create a painter to draw the icon
+    painter = QtGui.QPainter(pixmap)
+    painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+    
+    # Draw a blue rounded rectangle background
+    painter.setBrush(QtGui.QColor("#0078d4"))
+    painter.setPen(QtCore.Qt.PenStyle.NoPen)
+    painter.drawRoundedRect(2, 2, icon_size-4, icon_size-4, 12, 12)
+    
+    # Draw a white "W" in the center
+    painter.setPen(QtGui.QPen(QtGui.QColor("#FFFFFF"), 3))
+    painter.setFont(_font(36, QtGui.QFont.Weight.Bold))
+    painter.drawText(QtCore.QRect(0, 0, icon_size, icon_size), QtCore.Qt.AlignmentFlag.AlignCenter, "W")
+    
+    # End painting
+    painter.end()
+    
+    return QtGui.QIcon(pixmap)
 
 class LogTextEdit(QtWidgets.QPlainTextEdit):
     """Custom text edit widget for logging."""
@@ -62,49 +375,69 @@ class LogTextEdit(QtWidgets.QPlainTextEdit):
         self.setReadOnly(True)
         self.setMaximumBlockCount(5000)  # Limit number of lines for performance
         
+        # Read-only log: no undo history, and unwrapped lines skip paragraph re-layout
+        self.setUndoRedoEnabled(False)
+        self.setLineWrapMode(QtWidgets.QPlainTextEdit.LineWrapMode.NoWrap)
+        self.setWordWrapMode(QtGui.QTextOption.WrapMode.NoWrap)
+        
         # Custom font
-        font = QtGui.QFont("Segoe UI", 9)
-        self.setFont(font)
+        self.setFont(_font(9))
+
+# Interval and per-tick limit for moving queued log lines into the log widget
+LOG_DRAIN_INTERVAL_MS = 50
+LOG_DRAIN_MAX_RECORDS = 500
+
+# Qt platform plugins where drop shadows only cost time (no real compositor)
+SHADOWLESS_PLATFORMS = ("offscreen", "minimal", "vnc")
+
+# Minimum time between repaints of the same progress bar (~30 Hz)
+PROGRESS_MIN_INTERVAL = 0.033
 
 class LoggingHandler(logging.Handler):
-    """Custom logging handler that redirects logs to a Qt text widget."""
+    """Custom logging handler that queues logs for the Qt text widget.
+    
+    emit() never touches Qt, so it is safe to call from worker threads; the GUI
+    thread drains the queue on a timer and appends the lines in one batch.
+    """
     
-    def __init__(self, text_widget):
+    def __init__(self, log_queue):
         super().__init__()
-        self.text_widget = text_widget
+        self.log_queue = log_queue
         
     def emit(self, record):
-        msg = self.format(record)
-        QtCore.QMetaObject.invokeMethod(
-            self.text_widget,
-            "appendPlainText",
-            QtCore.Qt.ConnectionType.QueuedConnection,
-            QtCore.Q_ARG(str, msg)
-        )
+        try:
+            self.log_queue.put_nowait(self.format(record))
+        except Exception:
+            self.handleError(record)
 
 class CircularProgressBar(QtWidgets.QProgressBar):
     """Custom circular progress bar widget."""
     
+    PEN_WIDTH = 8
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setFixedSize(100, 100)
         self.setValue(0)
         self.setTextVisible(True)
-        self.setStyleSheet("""
-            QProgressBar {
-                border: none;
-                background-color: transparent;
-                border-radius: 50px;
-            }
-            QProgressBar::chunk {
-                background-color: transparent;
-            }
-        """)
+        
+        # The whole widget is drawn in paintEvent, so no per-widget stylesheet is needed;
+        # pens and font are built once instead of on every repaint
+        self._track_pen = QtGui.QPen(QtGui.QColor("#f0f0f0"), self.PEN_WIDTH)
+        self._text_pen = QtGui.QPen(QtGui.QColor("#202020"))
+        self._text_font = _font(12, QtGui.QFont.Weight.Bold)
+        
+        # Fixed size, so the arc geometry and gradient never change
+        inset = self.PEN_WIDTH // 2
+        self._arc_rect = QtCore.QRect(inset, inset, self.width() - self.PEN_WIDTH, self.height() - self.PEN_WIDTH)
+        gradient = QtGui.QConicalGradient(self.width() / 2, self.height() / 2, 270)
+        gradient.setColorAt(0, QtGui.QColor("#0078d4"))
+        gradient.setColorAt(1, QtGui.QColor("#00a2ed"))
+        self._progress_pen = QtGui.QPen(QtGui.QBrush(gradient), self.PEN_WIDTH,
+                                        QtCore.Qt.PenStyle.SolidLine, QtCore.Qt.PenCapStyle.RoundCap)
 
     def paintEvent(self, event):
         # Set up painter
-        width = self.width()
-        height = self.height()
         painter = QtGui.QPainter(self)
         painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
         
@@ -112,39 +445,198 @@ class CircularProgressBar(QtWidgets.QProgressBar):
         progress = self.value() / self.maximum()
         
         # Draw background circle
-        pen_width = 8
-        x = int(pen_width/2)
-        y = int(pen_width/2)
-        w = int(width-pen_width)
-        h = int(height-pen_width)
-        painter.setPen(QtGui.QPen(QtGui.QColor("#f0f0f0"), pen_width))
-        painter.drawArc(x, y, w, h, 0, 360*16)
+        painter.setPen(self._track_pen)
+        painter.drawArc(self._arc_rect, 0, 360*16)
         
         # Draw progress arc
         if progress > 0:
-            gradient = QtGui.QConicalGradient(width/2, height/2, 270)
-            gradient.setColorAt(0, QtGui.QColor("#0078d4"))
-            gradient.setColorAt(1, QtGui.QColor("#00a2ed"))
-            painter.setPen(QtGui.QPen(QtGui.QBrush(gradient), pen_width, QtCore.Qt.PenStyle.SolidLine, QtCore.Qt.PenCapStyle.RoundCap))
+            painter.setPen(self._progress_pen)
             span = int(-progress * 360 * 16)
-            painter.drawArc(x, y, w, h, 90*16, span)
+            painter.drawArc(self._arc_rect, 90*16, span)
         
         # Draw text in center
-        painter.setPen(QtGui.QColor("#202020"))
-        painter.setFont(QtGui.QFont("Segoe UI", 12, QtGui.QFont.Weight.Bold))
+        painter.setPen(self._text_pen)
+        painter.setFont(self._text_font)
         text = f"{int(progress * 100)}%"
         painter.drawText(self.rect(), QtCore.Qt.AlignmentFlag.AlignCenter, text)
 
-class WhisperBatchQt(QtWidgets.QMainWindow):
-    """Main Qt GUI Application for Whisper Batch."""
+class TranscriptionWorker(QtCore.QObject):
+    """Runs process_videos on a QThread it is moved to and reports progress through signals."""
     
     progress_update = QtCore.Signal(int, int, str)
     processing_complete = QtCore.Signal()
     processing_error = QtCore.Signal(str, str)
-    # Add new signals for detailed progress
     model_loading_progress = QtCore.Signal(int)  # 0-100 percentage
     file_detection_progress = QtCore.Signal(int)  # 0-100 percentage
     current_file_progress = QtCore.Signal(int)  # 0-100 percentage
+    finished = QtCore.Signal()  # Emitted last, whether the run completed, failed or was cancelled
+    
+    def __init__(self, input_dir, output_dir, model_size, language, device, output_format, skip_processed,
+                 max_workers=1, model_cache=None, device_indices=None, compute_type="auto",
+                 use_batched=False, batch_size=16, fast_preset=False, files=None):
+        super().__init__()
+        
+        self.input_dir = input_dir
+        self.output_dir = output_dir
+        self.model_size = model_size
+        self.language = language
+        self.device = device
+        self.output_format = output_format
+        self.skip_processed = skip_processed
+        self.max_workers = max_workers
+        self.compute_type = compute_type
+        self.model_cache = model_cache if model_cache is not None else {}
+        self.device_indices = device_indices
+        self.use_batched = use_batched
+        self.batch_size = batch_size
+        self.fast_preset = fast_preset
+        self.files = files
+        
+        # Last value sent on each detail progress signal, to skip repeats
+        self._last_stage_values = {}
+        
+    def cancel(self):
+        """Ask the worker to stop before the next file."""
+        self.thread().requestInterruption()
+        
+    def is_cancelled(self):
+        """Return True once cancel() has been called."""
+        # Asks the worker's own QThread, since the progress callback runs on
+        # process_videos' executor threads rather than on it
+        return self.thread().isInterruptionRequested()
+        
+    @QtCore.Slot()
+    def run(self):
+        """Run the transcription process on the worker thread."""
+        try:
+            from whisper_batch.main import collect_media_files, process_videos
+            
+            # Signal file detection start; a pre-scanned file list only needs filtering
+            self._emit_stage("file_detection_progress", 10 if self.files is None else 50)
+            
+            # Enumerate before loading the model, so finished files cost nothing
+            files = collect_media_files(self.input_dir, self.output_dir, self.output_format,
+                                        self.skip_processed, files=self.files)
+            self._emit_stage("file_detection_progress", 100)
+            if not files:
+                logger.info("No files left to process.")
+                self.processing_complete.emit()
+                return
+            
+            # Signal model loading started
+            self._emit_stage("model_loading_progress", 10)
+            
+            model = self._get_or_load_model()
+            if model is None:
+                raise RuntimeError(f"Failed to load the {self.model_size} model")
+            
+            # Run the main processing function
+            result = process_videos(
+                input_path=self.input_dir,
+                output_path=self.output_dir,
+                model_size=self.model_size,
+                language=self.language,
+                device=self.device,
+                output_format=self.output_format,
+                compute_type=self.compute_type,
+                max_workers=self.max_workers,
+                progress_callback=self._progress_callback,
+                model=model,
+                device_indices=self.device_indices,
+                use_batched=self.use_batched,
+                batch_size=self.batch_size,
+                fast_preset=self.fast_preset,
+                files=files
+            )
+            
+            if not self.is_cancelled():
+                # Signal processing complete
+                self.model_loading_progress.emit(100)
+                self.file_detection_progress.emit(100)
+                self.current_file_progress.emit(100)
+                self.processing_complete.emit()
+                # Count successful transcriptions from the results list
+                success_count = sum(1 for _, success, _ in result if success)
+                logger.info(f"Processing complete. Processed {len(result)} files with {success_count} successful transcriptions.")
+            else:
+                logger.info("Processing was cancelled by user.")
+                
+        except Exception as e:
+            logger.error(f"Error in processing: {e}", exc_info=True)
+            self.processing_error.emit("Processing Error", str(e))
+            
+        finally:
+            self.finished.emit()
+            
+    def _get_or_load_model(self):
+        """
+        Return the model for this run's settings, reusing one loaded by an earlier run.
+        
+        Returns:
+            The loaded Whisper model, or None if loading failed
+        """
+        from whisper_batch.transcriber import load_transcription_model
+        
+        # process_videos expects a passed-in model on the first selected GPU
+        device_index = self.device_indices[0] if self.device_indices else None
+        key = (self.model_size, self.device, device_index, self.compute_type)
+        model = self.model_cache.get(key)
+        if model is not None:
+            logger.info(f"Reusing loaded {self.model_size} model on {self.device}")
+            return model
+            
+        model = load_transcription_model(self.model_size, self.device, self.compute_type,
+                                         device_index=device_index)
+        if model is not None:
+            self.model_cache[key] = model
+        return model
+    
+    def _emit_stage(self, signal_name, value):
+        """Emit a detail progress value only if it differs from the last one sent."""
+        if self._last_stage_values.get(signal_name) != value:
+            self._last_stage_values[signal_name] = value
+            getattr(self, signal_name).emit(value)
+    
+    def _progress_callback(self, current, total, filename=""):
+        """Enhanced progress callback to update all progress indicators."""
+        # Check if cancellation was requested
+        if self.is_cancelled():
+            return False  # Signal to stop processing
+        
+        # First, update the model loading progress at the beginning
+        if current == 1 and total > 1:
+            # Start of processing, model should be loaded
+            self._emit_stage("model_loading_progress", 100)
+            # File detection completed after the first file is found
+            self._emit_stage("file_detection_progress", 100)
+        
+        # Update the main progress
+        self.progress_update.emit(current, total, filename)
+        
+        # Extract the stage from the filename for detailed progress
+        if isinstance(filename, str):
+            status = filename.lower()
+            
+            # The first keyword found in the filename/status decides the stage
+            for keyword, signal_name, value in PROGRESS_STAGES:
+                if keyword in status:
+                    self._emit_stage(signal_name, value)
+                    break
+            
+            # Reset current file progress when moving to a new file
+            if current > 1 and "processing" in status:
+                # Reset for new file
+                self._emit_stage("current_file_progress", 0)
+        
+        return True  # Continue processing
+
+class WhisperBatchQt(QtWidgets.QMainWindow):
+    """Main Qt GUI Application for Whisper Batch."""
+    
+    # (index, name) of each CUDA device, emitted by the system info probe
+    gpus_detected = QtCore.Signal(list)
+    # (input_dir, media files) from a background scan of the selected input directory
+    files_scanned = QtCore.Signal(str, list)
     
     def __init__(self):
         super().__init__()
@@ -159,56 +651,56 @@ class WhisperBatchQt(QtWidgets.QMainWindow):
         
         # Processing status variables
         self.is_processing = False
-        self.process_thread = None
-        self.cancel_requested = False
+        self.worker = None
+        
+        # Models loaded by earlier runs, keyed by (model_size, device, device_index, compute_type)
+        self._model_cache = {}
+        
+        # (input_dir, files) from the latest background scan of the input directory
+        self._scanned_files = None
         
-        # Create central widget with scroll area for better handling of small window sizes
-        self.scroll_area = QtWidgets.QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setFrameShape(QtWidgets.QFrame.Shape.NoFrame)
-        self.setCentralWidget(self.scroll_area)
+        self.worker_thread = None
         
-        # Create content widget to hold all components
+        # Throttled progress bar updates: last applied time and values waiting for the trailing edge
+        self._progress_applied_at = {}
+        self._pending_progress = {}
+        self._progress_flush_timer = QtCore.QTimer(self)
+        self._progress_flush_timer.setSingleShot(True)
+        self._progress_flush_timer.setInterval(int(PROGRESS_MIN_INTERVAL * 1000))
+        self._progress_flush_timer.timeout.connect(self._flush_pending_progress)
+        
+        # Create central widget; the panels carry their own margins
         self.central_widget = QtWidgets.QWidget()
-        self.scroll_area.setWidget(self.central_widget)
+        self.setCentralWidget(self.central_widget)
         
-        # Main layout with improved spacing
         self.main_layout = QtWidgets.QVBoxLayout(self.central_widget)
-        self.main_layout.setContentsMargins(20, 20, 20, 20)
-        self.main_layout.setSpacing(20)  # Increased spacing between main sections
+        self.main_layout.setContentsMargins(0, 0, 0, 0)
+        self.main_layout.setSpacing(0)
         
         # Setup UI components
         self._create_ui()
         
-        # Connect signals
-        self.progress_update.connect(self._update_progress)
-        self.processing_complete.connect(self._on_processing_complete)
-        self.processing_error.connect(self._show_error_dialog)
-        # Connect new progress signals
-        self.model_loading_progress_bar.valueChanged.connect(self._update_model_loading_progress)
-        self.file_detection_progress_bar.valueChanged.connect(self._update_file_detection_progress)
-        self.current_file_progress_bar.valueChanged.connect(self._update_current_file_progress)
-        
         # Configure logging to the GUI
         self._setup_logging()
         
-        # Display system info in the log
-        self._log_system_info()
+        self.gpus_detected.connect(self._populate_gpu_list)
+        self.files_scanned.connect(self._on_files_scanned)
+        
+        # Display system info in the log; importing torch and probing CUDA takes
+        # seconds, so it runs on a pool thread instead of delaying the first paint
+        QtCore.QThreadPool.globalInstance().start(self._log_system_info)
         
         # Apply Windows 11 style
         self._apply_win11_style()
         
         # Apply shadow effects to UI elements
         self._apply_shadow_effects()
-        
-        # Setup resize event monitoring for overlap detection
-        self._setup_overlap_detection()
     
     def _create_ui(self):
         """Create all UI elements."""
         # Create a horizontal splitter for main content and log
         self.main_splitter = QtWidgets.QSplitter(QtCore.Qt.Orientation.Horizontal)
-        self.scroll_area.setWidget(self.main_splitter)
+        self.main_layout.addWidget(self.main_splitter)
         
         # Create left panel for main controls
         self.left_panel = QtWidgets.QWidget()
@@ -230,6 +722,10 @@ class WhisperBatchQt(QtWidgets.QMainWindow):
         self.main_splitter.setStretchFactor(0, 7)
         self.main_splitter.setStretchFactor(1, 3)
         
+        # Panels never shrink below their layouts' minimum size, so the layout
+        # itself keeps widgets from overlapping at narrow window sizes
+        self.main_splitter.setChildrenCollapsible(False)
+        
         # Create toggle button for log
         self.toggle_log_button = QtWidgets.QPushButton("Hide Log")
         self.toggle_log_button.setCheckable(True)
@@ -262,6 +758,7 @@ class WhisperBatchQt(QtWidgets.QMainWindow):
         dir_layout.addWidget(input_label, 0, 0)
         
         self.input_dir_edit = QtWidgets.QLineEdit()
+        self.input_dir_edit.editingFinished.connect(self._scan_input_dir)
         dir_layout.addWidget(self.input_dir_edit, 0, 1)
         
         input_browse_btn = QtWidgets.QPushButton("Browse...")
@@ -336,8 +833,7 @@ class WhisperBatchQt(QtWidgets.QMainWindow):
         language_layout.addWidget(language_label)
         
         self.language_combo = QtWidgets.QComboBox()
-        for lang_name, _ in LANGUAGES:
-            self.language_combo.addItem(lang_name)
+        self.language_combo.addItems(LANGUAGE_NAMES)
         self.language_combo.setMinimumWidth(120)
         language_layout.addWidget(self.language_combo)
         
@@ -361,6 +857,24 @@ class WhisperBatchQt(QtWidgets.QMainWindow):
         device_layout.addWidget(self.device_combo)
         
         field_layout.addWidget(device_widget)
+        
+        # Compute type selection
+        compute_widget = QtWidgets.QWidget()
+        compute_layout = QtWidgets.QHBoxLayout(compute_widget)
+        compute_layout.setContentsMargins(0, 0, 0, 0)
+        compute_layout.setSpacing(10)
+        
+        compute_label = QtWidgets.QLabel("Precision:")
+        compute_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter)
+        compute_label.setStyleSheet("font-weight: bold;")
+        compute_layout.addWidget(compute_label)
+        
+        self.compute_combo = QtWidgets.QComboBox()
+        self.compute_combo.addItems(COMPUTE_TYPES)
+        self.compute_combo.setMinimumWidth(110)
+        compute_layout.addWidget(self.compute_combo)
+        
+        field_layout.addWidget(compute_widget)
         field_layout.addStretch(1)
         
         # Add the horizontal field container to the main layout
@@ -408,6 +922,59 @@ class WhisperBatchQt(QtWidgets.QMainWindow):
         self.skip_processed_check.setStyleSheet("margin-left: 40px; font-weight: bold;")
         settings_layout.addWidget(self.skip_processed_check, 4, 0, 1, 2)
         
+        # Number of files transcribed concurrently (each worker holds its own model)
+        workers_label = QtWidgets.QLabel("Workers:")
+        workers_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter)
+        workers_label.setStyleSheet("font-weight: bold;")
+        settings_layout.addWidget(workers_label, 5, 0)
+        
+        self.workers_spin = QtWidgets.QSpinBox()
+        self.workers_spin.setRange(1, max(1, os.cpu_count() or 1))
+        self.workers_spin.setValue(1)
+        self.workers_spin.setToolTip("Files transcribed in parallel. Each worker loads its own copy of the model.")
+        self.workers_spin.setFixedWidth(80)
+        settings_layout.addWidget(self.workers_spin, 5, 1, alignment=QtCore.Qt.AlignmentFlag.AlignLeft)
+        
+        # GPU selection, shown once the system info probe has found more than one device
+        self.gpu_label = QtWidgets.QLabel("GPUs:")
+        self.gpu_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignTop)
+        self.gpu_label.setStyleSheet("font-weight: bold;")
+        settings_layout.addWidget(self.gpu_label, 6, 0)
+        
+        self.gpu_list = QtWidgets.QListWidget()
+        self.gpu_list.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.MultiSelection)
+        self.gpu_list.setMaximumHeight(80)
+        self.gpu_list.setToolTip("Workers are spread over the selected GPUs round-robin.")
+        settings_layout.addWidget(self.gpu_list, 6, 1)
+        
+        self.gpu_label.hide()
+        self.gpu_list.hide()
+        
+        # Batched decoding of each file's 30s windows
+        self.batched_check = QtWidgets.QCheckBox("Batched inference")
+        self.batched_check.setChecked(False)
+        self.batched_check.setStyleSheet("margin-left: 40px; font-weight: bold;")
+        self.batched_check.setToolTip("Decode several 30s windows per forward pass. Faster on GPU, "
+                                      "but windows are not conditioned on each other.")
+        settings_layout.addWidget(self.batched_check, 7, 0)
+        
+        self.batch_spin = QtWidgets.QSpinBox()
+        self.batch_spin.setRange(1, 64)
+        self.batch_spin.setValue(16)
+        self.batch_spin.setToolTip("Windows decoded per forward pass")
+        self.batch_spin.setFixedWidth(80)
+        self.batch_spin.setEnabled(False)
+        self.batched_check.toggled.connect(self.batch_spin.setEnabled)
+        settings_layout.addWidget(self.batch_spin, 7, 1, alignment=QtCore.Qt.AlignmentFlag.AlignLeft)
+        
+        # Fast decoding preset
+        self.fast_preset_check = QtWidgets.QCheckBox("Fast preset")
+        self.fast_preset_check.setChecked(False)
+        self.fast_preset_check.setStyleSheet("margin-left: 40px; font-weight: bold;")
+        self.fast_preset_check.setToolTip("Greedy decoding at temperature 0 without previous-text conditioning, "
+                                          "skipping silence with VAD and filtering repeated phrases.")
+        settings_layout.addWidget(self.fast_preset_check, 8, 0, 1, 2)
+        
         # Set column stretch
         settings_layout.setColumnStretch(1, 1)
         
@@ -504,255 +1071,71 @@ class WhisperBatchQt(QtWidgets.QMainWindow):
         self.log_text = LogTextEdit()
         log_layout.addWidget(self.log_text)
         
-        self.right_layout.addWidget(log_group)
-        self.right_layout.addStretch()
+        # The log is the part of the window that grows
+        self.right_layout.addWidget(log_group, 1)
     
     def _apply_shadow_effects(self):
-        """Apply shadow effects to UI elements for a modern look."""
-        # Create shadow effect for buttons
-        for button in self.findChildren(QtWidgets.QPushButton):
-            shadow = QtWidgets.QGraphicsDropShadowEffect()
+        """Apply shadow effects to the action buttons for a modern look."""
+        # Blurred shadows are rasterized in software; skip them on headless/remote
+        # platform plugins or when disabled through the environment
+        if (QtGui.QGuiApplication.platformName() in SHADOWLESS_PLATFORMS
+                or os.environ.get("WHISPERBATCH_NO_SHADOWS")):
+            return
+            
+        # Graphics effects render their widget offscreen on every repaint, so they
+        # are kept off the large group boxes and limited to the two action buttons
+        for button in (self.start_button, self.cancel_button):
+            shadow = QtWidgets.QGraphicsDropShadowEffect(button)
             shadow.setBlurRadius(10)
             shadow.setColor(QtGui.QColor(0, 0, 0, 30))
             shadow.setOffset(0, 2)
             button.setGraphicsEffect(shadow)
         
-        # Create subtle shadow for group boxes
-        for group_box in self.findChildren(QtWidgets.QGroupBox):
-            shadow = QtWidgets.QGraphicsDropShadowEffect()
-            shadow.setBlurRadius(15)
-            shadow.setColor(QtGui.QColor(0, 0, 0, 20))
-            shadow.setOffset(0, 3)
-            group_box.setGraphicsEffect(shadow)
+        self._sync_shadow_effects()
+    
+    def _sync_shadow_effects(self):
+        """Only render button shadows while the buttons are enabled."""
+        for button in (self.start_button, self.cancel_button):
+            effect = button.graphicsEffect()
+            if effect is not None:
+                effect.setEnabled(button.isEnabled())
     
     def _apply_win11_style(self):
         """Apply Windows 11 modern style to the application."""
-        # Modern Windows 11 style with rounded corners and Mica-like effects
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #f8f8f8;
-            }
-            QWidget {
-                font-family: 'Segoe UI', sans-serif;
-                font-size: 10pt;
-            }
-            QScrollArea {
-                border: none;
-                background-color: transparent;
-            }
-            QGroupBox {
-                font-weight: bold;
-                font-size: 11pt;
-                border: 1px solid #d0d0d0;
-                border-radius: 8px;
-                margin-top: 2.5ex;
-                padding: 15px;
-                background-color: #ffffff;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 10px;
-                background-color: #ffffff;
-                color: #0078d4;
-            }
-            QPushButton {
-                background-color: #f0f0f0;
-                border: 1px solid #d8d8d8;
-                border-radius: 4px;
-                padding: 5px 15px;
-                color: #202020;
-                font-weight: normal;
-            }
-            QPushButton:hover {
-                background-color: #e8e8e8;
-                border: 1px solid #c8c8c8;
-            }
-            QPushButton:pressed {
-                background-color: #d8d8d8;
-            }
-            QPushButton:disabled {
-                color: #a0a0a0;
-                background-color: #f5f5f5;
-                border: 1px solid #e0e0e0;
-            }
-            #start_button {
-                background-color: #0078d4;
-                color: white;
-                font-weight: bold;
-                border: none;
-            }
-            #start_button:hover {
-                background-color: #006cbe;
-            }
-            #start_button:pressed {
-                background-color: #005ca3;
-            }
-            QComboBox {
-                border: 1px solid #d0d0d0;
-                border-radius: 4px;
-                padding: 2px 8px;
-                background-color: #ffffff;
-                selection-background-color: #0078d4;
-                min-height: 25px;
-                color: #000000;
-                font-size: 10pt;
-            }
-            QLineEdit {
-                border: 1px solid #d0d0d0;
-                border-radius: 4px;
-                padding: 2px 8px;
-                background-color: #ffffff;
-                selection-background-color: #0078d4;
-                min-height: 25px;
-                color: #000000;
-                font-size: 10pt;
-            }
-            QComboBox:focus, QLineEdit:focus {
-                border: 1px solid #0078d4;
-            }
-            QComboBox::drop-down {
-                subcontrol-origin: padding;
-                subcontrol-position: top right;
-                width: 20px;
-                border-left-width: 0px;
-                border-top-right-radius: 4px;
-                border-bottom-right-radius: 4px;
-            }
-            QComboBox::down-arrow {
-                image: url(data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIxMCIgaGVpZ2h0PSI2IiB2aWV3Qm94PSIwIDAgMTAgNiI+PHBhdGggZmlsbD0iIzQwNDA0MCIgZD0iTTAgMGw1IDUgNS01eiIvPjwvc3ZnPg==);
-                width: 10px;
-                height: 6px;
-                margin-right: 8px;
-            }
-            QComboBox QAbstractItemView {
-                border: 1px solid #d0d0d0;
-                selection-background-color: #0078d4;
-                selection-color: #ffffff;
-                background-color: #ffffff;
-                color: #000000;
-            }
-            QProgressBar {
-                border: 1px solid #d0d0d0;
-                border-radius: 4px;
-                text-align: center;
-                background-color: #f5f5f5;
-                height: 16px;
-                font-size: 9pt;
-            }
-            QProgressBar::chunk {
-                background-color: #0078d4;
-                border-radius: 3px;
-            }
-            QLabel {
-                color: #202020;
-                font-weight: normal;
-            }
-            QCheckBox {
-                spacing: 8px;
-                color: #202020;
-                min-height: 22px;
-                margin-left: 0px;
-                padding-left: 0px;
-            }
-            QRadioButton {
-                spacing: 8px;
-                color: #202020;
-                min-height: 22px;
-                min-width: 100px;
-            }
-            QCheckBox::indicator {
-                width: 16px;
-                height: 16px;
-                border: 1px solid #d0d0d0;
-                border-radius: 3px;
-                background-color: #ffffff;
-            }
-            QRadioButton::indicator {
-                width: 16px;
-                height: 16px;
-                border: 1px solid #d0d0d0;
-                border-radius: 9px;
-                background-color: #ffffff;
-            }
-            QCheckBox::indicator:hover, QRadioButton::indicator:hover {
-                border: 1px solid #0078d4;
-            }
-            QCheckBox::indicator:checked {
-                background-color: #0078d4;
-                border: 1px solid #0078d4;
-                image: url(data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIxMCIgaGVpZ2h0PSI4IiB2aWV3Qm94PSIwIDAgMTAgOCI+PHBhdGggZmlsbD0iI2ZmZmZmZiIgZD0iTTggMEwzLjUgNC41IDIgM2wtMiAyIDMuNSAzLjVMMTAgMmwtMi0yeiIvPjwvc3ZnPg==);
-                padding: 0px;
-            }
-            QRadioButton::indicator:checked {
-                background-color: #ffffff;
-                border: 1px solid #0078d4;
-            }
-            QRadioButton::indicator:checked {
-                image: url(data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSI4IiBoZWlnaHQ9IjgiIHZpZXdCb3g9IjAgMCA4IDgiPjxjaXJjbGUgZmlsbD0iIzAwNzhkNCIgY3g9IjQiIGN5PSI0IiByPSI0Ii8+PC9zdmc+);
-                padding: 2px;
-            }
-            QPlainTextEdit {
-                background-color: #ffffff;
-                border: 1px solid #d0d0d0;
-                border-radius: 4px;
-                padding: 5px;
-                selection-background-color: #0078d4;
-                selection-color: #ffffff;
-                color: #000000;
-            }
-            QScrollBar:vertical {
-                border: none;
-                background: #f0f0f0;
-                width: 8px;
-                margin: 0px;
-                border-radius: 4px;
-            }
-            QScrollBar::handle:vertical {
-                background: #c0c0c0;
-                min-height: 20px;
-                border-radius: 4px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background: #a0a0a0;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                height: 0px;
-            }
-            QScrollBar:horizontal {
-                border: none;
-                background: #f0f0f0;
-                height: 8px;
-                margin: 0px;
-                border-radius: 4px;
-            }
-            QScrollBar::handle:horizontal {
-                background: #c0c0c0;
-                min-width: 20px;
-                border-radius: 4px;
-            }
-            QScrollBar::handle:horizontal:hover {
-                background: #a0a0a0;
-            }
-            QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {
-                width: 0px;
-            }
-        """)
-        
-        # Set button names for specific styling
+        # Name the button before the sheet is applied so it is only polished once
         self.start_button.setObjectName("start_button")
+        self.setStyleSheet(_style_sheet())
     
     def _setup_logging(self):
         """Configure logging to output to the GUI."""
-        log_handler = LoggingHandler(self.log_text)
+        self._log_queue = queue.Queue()
+        log_handler = LoggingHandler(self._log_queue)
         log_handler.setFormatter(logging.Formatter(DEFAULT_LOG_FORMAT))
         
         # Add the handler to the root logger
         root_logger = logging.getLogger()
         root_logger.addHandler(log_handler)
         
+        # Move queued records into the log widget in batches on the GUI thread
+        self.log_timer = QtCore.QTimer(self)
+        self.log_timer.timeout.connect(self._drain_log_queue)
+        self.log_timer.start(LOG_DRAIN_INTERVAL_MS)
+        
         logger.info("GUI application started")
     
+    @QtCore.Slot()
+    def _drain_log_queue(self):
+        """Append pending log records to the log widget in a single call."""
+        lines = []
+        try:
+            while len(lines) < LOG_DRAIN_MAX_RECORDS:
+                lines.append(self._log_queue.get_nowait())
+        except queue.Empty:
+            pass
+            
+        if lines:
+            self.log_text.appendPlainText("\n".join(lines))
+    
     def _log_system_info(self):
         """Log system information for debugging purposes."""
         try:
@@ -773,10 +1156,15 @@ class WhisperBatchQt(QtWidgets.QMainWindow):
                     device_count = torch.cuda.device_count()
                     logger.info(f"CUDA device count: {device_count}")
                     
+                    gpus = []
                     for i in range(device_count):
                         device_name = torch.cuda.get_device_name(i)
                         device_capability = torch.cuda.get_device_capability(i)
                         logger.info(f"CUDA device {i}: {device_name} (Compute Capability: {device_capability})")
+                        gpus.append((i, device_name))
+                        
+                    # Runs on a pool thread; the signal is delivered on the GUI thread
+                    self.gpus_detected.emit(gpus)
                 except Exception as e:
                     logger.warning(f"Error getting CUDA device info: {e}")
             
@@ -791,6 +1179,22 @@ class WhisperBatchQt(QtWidgets.QMainWindow):
         except Exception as e:
             logger.error(f"Error logging system info: {e}")
     
+    @QtCore.Slot(list)
+    def _populate_gpu_list(self, gpus):
+        """Offer GPU selection when more than one CUDA device is available."""
+        if len(gpus) < 2:
+            return
+            
+        for index, name in gpus:
+            item = QtWidgets.QListWidgetItem(f"{index}: {name}")
+            item.setData(QtCore.Qt.ItemDataRole.UserRole, index)
+            self.gpu_list.addItem(item)
+        self.gpu_list.item(0).setSelected(True)
+        
+        self.gpu_label.show()
+        self.gpu_list.show()
+    
+    @QtCore.Slot()
     def _browse_input_dir(self):
         """Open file dialog to select input directory."""
         directory = QtWidgets.QFileDialog.getExistingDirectory(
@@ -799,7 +1203,33 @@ class WhisperBatchQt(QtWidgets.QMainWindow):
         )
         if directory:
             self.input_dir_edit.setText(directory)
+            self._scan_input_dir()
+    
+    @QtCore.Slot()
+    def _scan_input_dir(self):
+        """Start listing the media files of the input directory on a pool thread."""
+        input_dir = self.input_dir_edit.text()
+        if not input_dir:
+            return
+            
+        def scan():
+            # Walking a network share can take seconds, so this stays off the GUI thread
+            if not os.path.isdir(input_dir):
+                return
+            from whisper_batch.file_handler import get_media_files
+            self.files_scanned.emit(input_dir, get_media_files(input_dir))
+            
+        QtCore.QThreadPool.globalInstance().start(scan)
     
+    @QtCore.Slot(str, list)
+    def _on_files_scanned(self, input_dir, files):
+        """Keep the scan result for the next run if the input directory is unchanged."""
+        if input_dir != self.input_dir_edit.text():
+            return
+        self._scanned_files = (input_dir, files)
+        logger.info(f"Found {len(files)} media files in {input_dir}")
+    
+    @QtCore.Slot()
     def _browse_output_dir(self):
         """Open file dialog to select output directory."""
         directory = QtWidgets.QFileDialog.getExistingDirectory(
@@ -809,6 +1239,7 @@ class WhisperBatchQt(QtWidgets.QMainWindow):
         if directory:
             self.output_dir_edit.setText(directory)
     
+    @QtCore.Slot()
     def _start_transcription(self):
         """Start the transcription process."""
         if self.is_processing:
@@ -826,7 +1257,7 @@ class WhisperBatchQt(QtWidgets.QMainWindow):
         
         # Get language code from selected language name
         language_name = self.language_combo.currentText()
-        language = next((code for name, code in LANGUAGES if name == language_name), None)
+        language = LANGUAGE_CODES.get(language_name)
         
         device = self.device_combo.currentText()
         
@@ -836,143 +1267,76 @@ class WhisperBatchQt(QtWidgets.QMainWindow):
             
         output_format = "txt" if self.format_txt_radio.isChecked() else "srt"
         skip_processed = self.skip_processed_check.isChecked()
+        max_workers = self.workers_spin.value()
+        compute_type = self.compute_combo.currentText()
+        use_batched = self.batched_check.isChecked()
+        batch_size = self.batch_spin.value()
+        fast_preset = self.fast_preset_check.isChecked()
+        
+        # Files found by the background scan, if it has finished for this directory
+        files = None
+        if self._scanned_files and self._scanned_files[0] == input_dir:
+            files = self._scanned_files[1]
+            
+        device_indices = None
+        if device != "cpu" and self.gpu_list.isVisible():
+            device_indices = sorted(item.data(QtCore.Qt.ItemDataRole.UserRole)
+                                    for item in self.gpu_list.selectedItems()) or None
         
         # Update UI state
         self.is_processing = True
-        self.cancel_requested = False
         self.start_button.setEnabled(False)
         self.cancel_button.setEnabled(True)
+        self._sync_shadow_effects()
         
-        # Reset progress bar
-        self.progress_bar.setValue(0)
+        # Reset progress indicators
+        self._set_all_progress(0)
         self.status_label.setText("Starting transcription...")
         
-        # Start processing in a separate thread
-        self.process_thread = threading.Thread(
-            target=self._run_processing,
-            args=(input_dir, output_dir, model_size, language, device, output_format, skip_processed)
-        )
-        self.process_thread.daemon = True
-        self.process_thread.start()
-    
-    def _run_processing(self, input_dir, output_dir, model_size, language, device, output_format, skip_processed):
-        """Run the transcription process in a background thread."""
-        try:
-            # Signal model loading started
-            self.model_loading_progress.emit(10)
-            
-            # Define a progress callback to update the UI
-            def progress_callback(current, total, filename=""):
-                # Check if cancellation was requested
-                if self.cancel_requested:
-                    return False  # Signal to stop processing
-                
-                # Update progress
-                self.progress_update.emit(current, total, filename)
-                
-                # Update current file progress (assume equal progress for each file)
-                file_percentage = 0
-                if "Transcribing" in filename:
-                    # Update current file progress
-                    file_percentage = 50  # Start at 50% when transcribing begins
-                    self.current_file_progress.emit(file_percentage)
-                elif "Processing" in filename:
-                    # File is being processed
-                    file_percentage = 25  # Start at 25% when processing begins
-                    self.current_file_progress.emit(file_percentage)
-                
-                return True  # Continue processing
-            
-            # Signal file detection start
-            self.file_detection_progress.emit(10)
-            
-            # Run the main processing function
-            result = process_videos(
-                input_path=input_dir,
-                output_path=output_dir,
-                model_size=model_size,
-                language=language,
-                device=device,
-                output_format=output_format,
-                max_workers=1,
-                progress_callback=self._enhanced_progress_callback
-            )
-            
-            if not self.cancel_requested:
-                # Signal processing complete
-                self.model_loading_progress.emit(100)
-                self.file_detection_progress.emit(100)
-                self.current_file_progress.emit(100)
-                self.processing_complete.emit()
-                # Count successful transcriptions from the results list
-                success_count = sum(1 for _, success, _ in result if success)
-                logger.info(f"Processing complete. Processed {len(result)} files with {success_count} successful transcriptions.")
-            else:
-                logger.info("Processing was cancelled by user.")
-                
-        except Exception as e:
-            logger.error(f"Error in processing: {e}", exc_info=True)
-            self.processing_error.emit("Processing Error", str(e))
-            
-    def _enhanced_progress_callback(self, current, total, filename=""):
-        """Enhanced progress callback to update all progress indicators."""
-        # Check if cancellation was requested
-        if self.cancel_requested:
-            return False  # Signal to stop processing
-        
-        # First, update the model loading progress at the beginning
-        if current == 1 and total > 1:
-            # Start of processing, model should be loaded
-            self.model_loading_progress.emit(100)
-            # File detection completed after the first file is found
-            self.file_detection_progress.emit(100)
-        
-        # Update the main progress
-        self.progress_update.emit(current, total, filename)
-        
-        # Extract the stage from the filename for detailed progress
-        if isinstance(filename, str):
-            # Check for specific keywords in the filename/status
-            if "loading model" in filename.lower():
-                self.model_loading_progress.emit(50)
-            elif "detecting files" in filename.lower():
-                self.file_detection_progress.emit(50)
-            elif "transcribing" in filename.lower():
-                # Increment file progress for transcription stage
-                self.current_file_progress.emit(75)
-            elif "processing" in filename.lower():
-                # Initial file processing
-                self.current_file_progress.emit(25)
-            elif "complete" in filename.lower():
-                # File completed
-                self.current_file_progress.emit(100)
-            
-            # Reset current file progress when moving to a new file
-            if current > 1 and "processing" in filename.lower():
-                # Reset for new file
-                self.current_file_progress.emit(0)
-        
-        return True  # Continue processing
+        # Start processing on a worker thread
+        self.worker = TranscriptionWorker(input_dir, output_dir, model_size, language, device,
+                                          output_format, skip_processed, max_workers,
+                                          model_cache=self._model_cache, device_indices=device_indices,
+                                          compute_type=compute_type, use_batched=use_batched,
+                                          batch_size=batch_size, fast_preset=fast_preset, files=files)
+        self.worker_thread = QtCore.QThread(self)
+        self.worker.moveToThread(self.worker_thread)
+        self.worker_thread.started.connect(self.worker.run)
+        self.worker.finished.connect(self.worker_thread.quit)
+        self.worker.finished.connect(self.worker.deleteLater)
+        self.worker_thread.finished.connect(self.worker_thread.deleteLater)
+        
+        # The worker lives on another thread, so these are queued onto the GUI thread
+        self.worker.progress_update.connect(self._update_progress)
+        self.worker.processing_complete.connect(self._on_processing_complete)
+        self.worker.processing_error.connect(self._show_error_dialog)
+        self.worker.model_loading_progress.connect(self._update_model_loading_progress)
+        self.worker.file_detection_progress.connect(self._update_file_detection_progress)
+        self.worker.current_file_progress.connect(self._update_current_file_progress)
+        self.worker.finished.connect(self._reset_processing_state)
+        self.worker_thread.start()
     
+    @QtCore.Slot(int, int, str)
     def _update_progress(self, current, total, filename):
         """Update progress bar and status label."""
         percentage = int((current / max(total, 1)) * 100)
-        self.progress_bar.setValue(percentage)
+        self._set_progress(self.progress_bar, percentage)
         
         if filename:
-            self.status_label.setText(f"Processing: {filename} ({current}/{total})")
+            status = f"Processing: {filename} ({current}/{total})"
         else:
-            self.status_label.setText(f"Processing: {current}/{total}")
+            status = f"Processing: {current}/{total}"
+        if status != self.status_label.text():
+            self.status_label.setText(status)
     
+    @QtCore.Slot()
     def _on_processing_complete(self):
         """Handle processing complete event."""
         self.status_label.setText("Processing complete!")
-        self.progress_bar.setValue(100)
-        self.model_loading_progress_bar.setValue(100)
-        self.file_detection_progress_bar.setValue(100)
-        self.current_file_progress_bar.setValue(100)
+        self._set_all_progress(100)
         self._reset_processing_state()
     
+    @QtCore.Slot(str, str)
     def _show_error_dialog(self, title, message):
         """Show error dialog with details."""
         dialog = QtWidgets.QMessageBox(self)
@@ -1011,28 +1375,30 @@ class WhisperBatchQt(QtWidgets.QMainWindow):
         
         dialog.exec()
     
+    @QtCore.Slot()
     def _cancel_transcription(self):
         """Cancel the transcription process."""
         if not self.is_processing:
             return
             
-        self.cancel_requested = True
+        self.worker_thread.requestInterruption()
         self.status_label.setText("Cancelling...")
         self.cancel_button.setEnabled(False)
+        self._sync_shadow_effects()
     
+    @QtCore.Slot()
     def _reset_processing_state(self):
         """Reset processing state after completion or cancellation."""
         self.is_processing = False
-        self.cancel_requested = False
+        self.worker = None
+        self.worker_thread = None
         self.start_button.setEnabled(True)
         self.cancel_button.setEnabled(False)
+        self._sync_shadow_effects()
         
         # Reset all progress indicators if cancellation occurred without completion
         if not self.progress_bar.value() == 100:
-            self.progress_bar.setValue(0)
-            self.model_loading_progress_bar.setValue(0)
-            self.file_detection_progress_bar.setValue(0)
-            self.current_file_progress_bar.setValue(0)
+            self._set_all_progress(0)
             self.status_label.setText("Ready")
     
     def _validate_inputs(self):
@@ -1105,8 +1471,11 @@ class WhisperBatchQt(QtWidgets.QMainWindow):
             """)
             
             if confirm.exec() == QtWidgets.QMessageBox.StandardButton.Yes:
-                # Cancel processing and close
-                self.cancel_requested = True
+                # Cancel processing and let the current file finish, since the
+                # thread must not be destroyed while it is still running
+                self.worker_thread.requestInterruption()
+                self.worker_thread.quit()
+                self.worker_thread.wait()
                 event.accept()
             else:
                 event.ignore()
@@ -1114,128 +1483,12 @@ class WhisperBatchQt(QtWidgets.QMainWindow):
             event.accept()
 
     def _create_app_icon(self):
-        """Create a simple application icon programmatically."""
-        # Create a pixmap for the icon
-        icon_size = 64
-        pixmap = QtGui.QPixmap(icon_size, icon_size)
-        pixmap.fill(QtCore.Qt.GlobalColor.transparent)
-        
-        # Create a painter to draw the icon
-        painter = QtGui.QPainter(pixmap)
-        painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
-        
-        # Draw a blue rounded rectangle background
-        painter.setBrush(QtGui.QColor("#0078d4"))
-        painter.setPen(QtCore.Qt.PenStyle.NoPen)
-        painter.drawRoundedRect(2, 2, icon_size-4, icon_size-4, 12, 12)
-        
-        # Draw a white "W" in the center
-        painter.setPen(QtGui.QPen(QtGui.QColor("#FFFFFF"), 3))
-        painter.setFont(QtGui.QFont("Segoe UI", 36, QtGui.QFont.Weight.Bold))
-        painter.drawText(QtCore.QRect(0, 0, icon_size, icon_size), QtCore.Qt.AlignmentFlag.AlignCenter, "W")
-        
-        # End painting
-        painter.end()
-        
-        # Set the window icon
-        self.setWindowIcon(QtGui.QIcon(pixmap))
+        """Set the application icon drawn by _build_app_icon."""
+        self.setWindowIcon(_build_app_icon())
 
-    def _setup_overlap_detection(self):
-        """Setup overlap detection for layout debugging."""
-        # Create a timer to periodically check for overlaps
-        self.overlap_timer = QtCore.QTimer(self)
-        self.overlap_timer.setInterval(1000)  # Check every second
-        self.overlap_timer.timeout.connect(self._check_widget_overlaps)
-        self.overlap_timer.start()
-    
-    def _check_widget_overlaps(self):
-        """Check if any widgets in the layout are overlapping."""
-        if not hasattr(self, 'left_panel') or not hasattr(self, 'right_panel'):
-            return
-        
-        # Get all visible widgets in the left panel layout
-        widgets = []
-        for i in range(self.left_layout.count()):
-            item = self.left_layout.itemAt(i)
-            if item.widget() and item.widget().isVisible():
-                widgets.append(item.widget())
-        
-        # Add visible widgets from right panel if it's visible
-        if self.right_panel.isVisible():
-            for i in range(self.right_layout.count()):
-                item = self.right_layout.itemAt(i)
-                if item.widget() and item.widget().isVisible():
-                    widgets.append(item.widget())
-        
-        # Check for overlaps between widgets
-        overlaps = []
-        for i, widget1 in enumerate(widgets):
-            for widget2 in widgets[i+1:]:
-                if self._widgets_overlap(widget1, widget2):
-                    overlaps.append((widget1.objectName() or type(widget1).__name__, 
-                                   widget2.objectName() or type(widget2).__name__))
-        
-        # Log any overlaps found
-        if overlaps:
-            logger.warning(f"Widget overlaps detected: {overlaps}")
-            
-            # If scroll area is needed but scroll bars aren't visible, ensure they are
-            if not self.scroll_area.horizontalScrollBar().isVisible() and not self.scroll_area.verticalScrollBar().isVisible():
-                self.scroll_area.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-                self.scroll_area.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-                logger.info("Enabling scroll bars due to component overlap")
-    
-    def _widgets_overlap(self, widget1, widget2):
-        """Check if two widgets overlap in the UI."""
-        # Get global positions
-        geo1 = widget1.geometry()
-        geo2 = widget2.geometry()
-        
-        # Convert to global coordinates
-        pos1 = widget1.mapToGlobal(QtCore.QPoint(0, 0))
-        pos2 = widget2.mapToGlobal(QtCore.QPoint(0, 0))
-        
-        # Create QRects in global coordinates
-        rect1 = QtCore.QRect(pos1.x(), pos1.y(), geo1.width(), geo1.height())
-        rect2 = QtCore.QRect(pos2.x(), pos2.y(), geo2.width(), geo2.height())
-        
-        # Check for intersection
-        return rect1.intersects(rect2)
-    
-    def resizeEvent(self, event):
-        """Handle resize events to check if content fits in the window."""
-        super().resizeEvent(event)
-        
-        # Get content size and available window size
-        left_size = self.left_panel.sizeHint()
-        right_size = self.right_panel.sizeHint() if self.right_panel.isVisible() else QtCore.QSize(0, 0)
-        
-        # Calculate total content width and height
-        content_width = left_size.width() + (right_size.width() if self.right_panel.isVisible() else 0)
-        content_height = max(left_size.height(), right_size.height() if self.right_panel.isVisible() else 0)
-        
-        # Get available window size
-        window_size = self.size()
-        
-        # Check if content is larger than the window
-        if content_height > window_size.height() or content_width > window_size.width():
-            # Enable scroll bars
-            self.scroll_area.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-            self.scroll_area.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-            
-            if content_height > window_size.height():
-                logger.debug(f"Content height ({content_height}) exceeds window height ({window_size.height()}), enabling scroll bars")
-        else:
-            # Content fits, disable scroll bars
-            self.scroll_area.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-            self.scroll_area.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-    
     def showEvent(self, event):
         """Initialize UI state when the window is first shown."""
         super().showEvent(event)
-        # Perform an initial check once all widgets are properly laid out
-        QtCore.QTimer.singleShot(100, self._check_widget_overlaps)
-        QtCore.QTimer.singleShot(100, lambda: self.resizeEvent(None))
         # Adjust window size based on content after UI is fully initialized
         QtCore.QTimer.singleShot(200, self._adjust_window_size)
     
@@ -1279,18 +1532,69 @@ class WhisperBatchQt(QtWidgets.QMainWindow):
         frame_geometry.moveCenter(center_point)
         self.move(frame_geometry.topLeft())
 
+    def _set_progress(self, bar, value, force=False):
+        """
+        Set a progress bar value, repainting each bar at most every PROGRESS_MIN_INTERVAL.
+        
+        Values arriving faster are held back and the latest one is applied by the
+        flush timer, so the final value always lands.
+        
+        Args:
+            bar (QProgressBar): The bar to update
+            value (int): New value (0-100)
+            force (bool): Apply immediately, discarding any held-back value
+        """
+        now = time.monotonic()
+        if force or now - self._progress_applied_at.get(bar, 0.0) >= PROGRESS_MIN_INTERVAL:
+            self._pending_progress.pop(bar, None)
+            self._progress_applied_at[bar] = now
+            if bar.value() != value:
+                bar.setValue(value)
+        else:
+            self._pending_progress[bar] = value
+            if not self._progress_flush_timer.isActive():
+                self._progress_flush_timer.start()
+    
+    def _set_all_progress(self, value):
+        """
+        Set every progress indicator at once, repainting the window a single time.
+        
+        Args:
+            value (int): Value for all bars (0-100)
+        """
+        self.setUpdatesEnabled(False)
+        try:
+            for bar in (self.progress_bar, self.model_loading_progress_bar,
+                        self.file_detection_progress_bar, self.current_file_progress_bar):
+                with QtCore.QSignalBlocker(bar):
+                    self._set_progress(bar, value, force=True)
+        finally:
+            # Re-enabling updates schedules one repaint for all of them
+            self.setUpdatesEnabled(True)
+    
+    @QtCore.Slot()
+    def _flush_pending_progress(self):
+        """Apply the values held back by _set_progress."""
+        pending, self._pending_progress = self._pending_progress, {}
+        for bar, value in pending.items():
+            self._set_progress(bar, value, force=True)
+    
+    @QtCore.Slot(int)
     def _update_model_loading_progress(self, percentage):
         """Update model loading progress wheel."""
-        self.model_loading_progress_bar.setValue(percentage)
+        self._set_progress(self.model_loading_progress_bar, percentage)
         
+    @QtCore.Slot(int)
     def _update_file_detection_progress(self, percentage):
         """Update file detection progress wheel."""
-        self.file_detection_progress_bar.setValue(percentage)
+        self._set_progress(self.file_detection_progress_bar, percentage)
         
+    @QtCore.Slot(int)
     def _update_current_file_progress(self, percentage):
         """Update current file progress wheel."""
-        self.current_file_progress_bar.setValue(percentage)
+        self._set_progress(self.current_file_progress_bar, percentage)
 
+    @QtCore.Slot()
     def _toggle_log_panel(self):
         """Toggle the visibility of the log panel."""
         if self.toggle_log_button.isChecked():
@@ -1310,7 +1614,7 @@ def main():
     app = QtWidgets.QApplication(sys.argv)
     
     # Set up application-wide font
-    app.setFont(QtGui.QFont("Segoe UI", 9))
+    app.setFont(_font(9))
     
     # Apply Windows 11 style if on Windows
     if sys.platform == "win32":
@@ -3,18 +3,23 @@ from tkinter import ttk, filedialog, messagebox
 import os
 import sys
 import threading
-import queue
 import logging
+import time
+import functools
+import re
+import shutil
+import subprocess
+from collections import deque
 from pathlib import Path
 
 # Ensure the src directory is in the Python path
 project_root = Path(__file__).resolve().parent.parent.parent
-sys.path.insert(0, str(project_root / 'src'))
+src_path = str(project_root / 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
 
 try:
     from whisper_batch import DEFAULT_LOG_FORMAT
-    import whisper_batch.file_handler as file_handler
-    from whisper_batch.main import process_videos
 except ImportError as e:
     print(f"Error importing modules: {e}")
     print("Ensure you are running from the project root or the script can find the 'src' directory.")
@@ -49,6 +54,77 @@ LANGUAGES = [
     # Add more languages as needed
 ]
 
+# Display names in combo order, and display name -> language code
+LANGUAGE_NAMES = tuple(name for name, _ in LANGUAGES)
+LANGUAGE_CODES = dict(LANGUAGES)
+
+@functools.lru_cache(maxsize=1)
+def _cuda_info():
+    """
+    Probe CUDA once per process; importing torch alone can take seconds.
+    
+    Returns:
+        tuple: (available, ((device_name, compute_capability), ...))
+    """
+    import torch
+    
+    if not torch.cuda.is_available():
+        return False, ()
+    devices = tuple((torch.cuda.get_device_name(i), torch.cuda.get_device_capability(i))
+                    for i in range(torch.cuda.device_count()))
+    return True, devices
+
+@functools.lru_cache(maxsize=1)
+def _ffmpeg_info():
+    """
+    Locate FFmpeg and read its version once per process.
+    
+    Returns:
+        tuple: (ffmpeg_path, version_line); both None if FFmpeg is not on the PATH,
+            and version_line is None if it could not be read
+    """
+    ffmpeg_path = shutil.which("ffmpeg")
+    if not ffmpeg_path:
+        return None, None
+        
+    try:
+        # Only the first line is wanted; the build configuration that follows is not read
+        with subprocess.Popen([ffmpeg_path, "-version"], stdout=subprocess.PIPE,
+                              stderr=subprocess.DEVNULL, text=True) as process:
+            version_line = process.stdout.readline().rstrip()
+            process.stdout.close()
+            process.terminate()
+        return ffmpeg_path, version_line or None
+    except Exception as e:
+        logger.warning(f"Error checking FFmpeg version: {e}")
+        return ffmpeg_path, None
+
+# Delay between a log record arriving and the batch it belongs to reaching the widget
+LOG_FLUSH_INTERVAL_MS = 50
+
+# Error message patterns, checked in order, and the advice added to a matching message
+_ERROR_CATEGORIES = (
+    (re.compile(r"cuda|gpu|cudnn", re.IGNORECASE),
+     "GPU error: {msg}\n\nTry running with CPU mode enabled (uncheck 'Use GPU')."),
+    (re.compile(r"ffmpeg", re.IGNORECASE),
+     "FFmpeg error: {msg}\n\nMake sure FFmpeg is properly installed and in your PATH."),
+    (re.compile(r"permission|access", re.IGNORECASE),
+     "File access error: {msg}\n\nCheck if you have permissions to access the input/output directories."),
+)
+
+# Details shown in the error dialog for a failed run
+_ERROR_DETAILS_TEMPLATE = "Error: {msg}\n\nPlease check the log file for more details.\n"
+
+# Minimum time between progress messages posted by the worker; updates in between
+# are coalesced into the latest one
+PROGRESS_MIN_INTERVAL = 0.05
+
+# Interval of the fallback progress poll, in case a <<Progress>> event is ever lost
+PROGRESS_POLL_INTERVAL_MS = 500
+
+# Lines kept in the log widget; older lines are dropped as new ones arrive
+LOG_MAX_LINES = 5000
+
 class LoggingHandler(logging.Handler):
     """Custom logging handler that redirects logs to a tkinter Text widget."""
     
@@ -56,19 +132,55 @@ class LoggingHandler(logging.Handler):
         super().__init__()
         self.text_widget = text_widget
         
+        # Formatted records waiting for the next flush, and whether one is scheduled
+        self._buf = deque()
+        self._scheduled = False
+        
+        # Widget methods used on every flush, bound once
+        self._configure = text_widget.configure
+        self._insert = text_widget.insert
+        self._delete = text_widget.delete
+        self._index = text_widget.index
+        self._see = text_widget.see
+        
     def emit(self, record):
         msg = self.format(record)
+        self._buf.append(msg)
         
         # Tkinter is not thread-safe, so we need to use after() 
-        # to schedule updates from non-main threads
-        self.text_widget.after(0, self._append_log, msg)
+        # to schedule updates from non-main threads; one flush covers
+        # every record that arrives before it runs
+        if not self._scheduled:
+            self._scheduled = True
+            try:
+                self.text_widget.after(LOG_FLUSH_INTERVAL_MS, self._flush)
+            except RuntimeError:
+                # Raised for calls from other threads before the main loop runs;
+                # the next record tries again
+                self._scheduled = False
     
-    def _append_log(self, msg):
-        """Append log message to text widget"""
-        self.text_widget.configure(state='normal')
-        self.text_widget.insert(tk.END, msg + '\n')
-        self.text_widget.see(tk.END)  # Scroll to the end
-        self.text_widget.configure(state='disabled')
+    def _flush(self):
+        """Append all buffered log messages to the text widget in one insert"""
+        # Cleared before draining, so a record appended meanwhile schedules another flush
+        self._scheduled = False
+        batch = []
+        while self._buf:
+            batch.append(self._buf.popleft())
+        if not batch:
+            return
+            
+        batch.append('')  # Trailing newline
+        
+        self._configure(state='normal')
+        self._insert(tk.END, '\n'.join(batch))
+        
+        # Keep only the last LOG_MAX_LINES lines (the widget always ends with an empty line)
+        line_count = int(self._index('end-1c').split('.')[0]) - 1
+        if line_count > LOG_MAX_LINES:
+            self._delete('1.0', f'{line_count - LOG_MAX_LINES + 1}.0')
+            
+        self._see(tk.END)  # Scroll to the end
+        self._configure(state='disabled')
 
 class WhisperBatchGUI(tk.Tk):
     """Main Tkinter GUI Application for Whisper Batch."""
@@ -93,7 +205,19 @@ class WhisperBatchGUI(tk.Tk):
         # Processing status variables
         self.is_processing = False
         self.process_thread = None
-        self.progress_queue = queue.Queue()
+        # One producer (the worker thread) and one consumer (the Tk loop), so a deque's
+        # atomic append/popleft is enough and avoids Queue's lock and condition variable
+        self.progress_queue = deque()
+        
+        # Set to stop the worker before its next file; process_videos checks it
+        # through the progress callback
+        self._stop_event = threading.Event()
+        self._closing = False
+        
+        # Error dialog, built on first use and reused for later errors
+        self._error_dialog = None
+        self._error_details = None
+        self._error_dialog_closed = tk.BooleanVar(value=False)
         
         # Set up UI components
         self._create_widgets()
@@ -102,8 +226,12 @@ class WhisperBatchGUI(tk.Tk):
         # Configure logging to the GUI
         self._setup_logging()
         
-        # Display system info in the log
-        self._log_system_info()
+        # Display system info in the log; importing torch and probing CUDA can take
+        # seconds, so it runs on a daemon thread and the window appears immediately
+        threading.Thread(target=self._log_system_info, daemon=True).start()
+        
+        # The worker thread posts <<Progress>> after queueing each message
+        self.bind("<<Progress>>", self._drain_progress)
         
         # Add a protocol handler for the close event
         self.protocol("WM_DELETE_WINDOW", self._on_close)
@@ -134,7 +262,7 @@ class WhisperBatchGUI(tk.Tk):
         # Language selection
         ttk.Label(self.settings_frame, text="Language:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=5)
         language_combo = ttk.Combobox(self.settings_frame, textvariable=self.language_var, 
-                                      values=[lang[0] for lang in LANGUAGES], state="readonly")
+                                      values=LANGUAGE_NAMES, state="readonly")
         language_combo.grid(row=1, column=1, sticky=tk.W, padx=5, pady=5)
         
         # Device selection
@@ -202,45 +330,39 @@ class WhisperBatchGUI(tk.Tk):
     
     def _setup_logging(self):
         """Configure logging to output to the GUI."""
-        log_handler = LoggingHandler(self.log_text)
-        log_handler.setFormatter(logging.Formatter(DEFAULT_LOG_FORMAT))
+        self._log_handler = LoggingHandler(self.log_text)
+        self._log_handler.setFormatter(logging.Formatter(DEFAULT_LOG_FORMAT))
         
         # Add the handler to the root logger
         root_logger = logging.getLogger()
-        root_logger.addHandler(log_handler)
+        root_logger.addHandler(self._log_handler)
         
         logger.info("GUI application started")
     
     def _log_system_info(self):
         """Log system information for debugging purposes."""
         try:
-            import sys
             import platform
-            import torch
             
             logger.info("--- System Information ---")
             logger.info(f"OS: {platform.system()} {platform.version()}")
             logger.info(f"Python: {sys.version}")
             
             # Check for CUDA and GPU
-            cuda_available = torch.cuda.is_available()
-            logger.info(f"CUDA available: {cuda_available}")
-            
-            if cuda_available:
-                try:
-                    device_count = torch.cuda.device_count()
-                    logger.info(f"CUDA device count: {device_count}")
+            try:
+                cuda_available, devices = _cuda_info()
+                logger.info(f"CUDA available: {cuda_available}")
+                
+                if cuda_available:
+                    logger.info(f"CUDA device count: {len(devices)}")
                     
-                    for i in range(device_count):
-                        device_name = torch.cuda.get_device_name(i)
-                        device_capability = torch.cuda.get_device_capability(i)
+                    for i, (device_name, device_capability) in enumerate(devices):
                         logger.info(f"CUDA device {i}: {device_name} (Compute Capability: {device_capability})")
-                except Exception as e:
-                    logger.warning(f"Error getting CUDA device info: {e}")
+            except Exception as e:
+                logger.warning(f"Error getting CUDA device info: {e}")
             
             # Check for ffmpeg
-            import shutil
-            ffmpeg_path = shutil.which("ffmpeg")
+            ffmpeg_path, _ = _ffmpeg_info()
             logger.info(f"FFmpeg found: {ffmpeg_path is not None}")
             if ffmpeg_path:
                 logger.info(f"FFmpeg path: {ffmpeg_path}")
@@ -271,12 +393,7 @@ class WhisperBatchGUI(tk.Tk):
             return
         
         # Get selected language code from the language name
-        selected_language = self.language_var.get()
-        language_code = None
-        for lang_name, lang_code in LANGUAGES:
-            if lang_name == selected_language:
-                language_code = lang_code
-                break
+        language_code = LANGUAGE_CODES.get(self.language_var.get())
         
         # Prepare the parameters for the processing function
         input_dir = Path(self.input_dir.get())
@@ -291,6 +408,7 @@ class WhisperBatchGUI(tk.Tk):
         self.start_button.config(state=tk.DISABLED)
         self.cancel_button.config(state=tk.NORMAL)
         self.status_label.config(text="Processing...")
+        self._stop_event.clear()
         
         # Start processing in a separate thread
         self.process_thread = threading.Thread(
@@ -300,56 +418,84 @@ class WhisperBatchGUI(tk.Tk):
         )
         self.process_thread.start()
         
-        # Start monitoring the progress
-        self.after(100, self._check_progress)
+        # Start the fallback progress poll
+        self.after(PROGRESS_POLL_INTERVAL_MS, self._poll_progress)
+    
+    def _post_progress(self, msg):
+        """Queue a progress message and wake the Tk loop to handle it (called from the worker thread)."""
+        self.progress_queue.append(msg)
+        if self._closing:
+            # The Tk loop is blocked waiting for this thread in _on_close
+            return
+        try:
+            self.event_generate("<<Progress>>", when="tail")
+        except (tk.TclError, RuntimeError):
+            # The window is gone or its loop has stopped; the message is not needed any more
+            pass
     
     def _run_processing(self, input_dir, output_dir, model_size, language, device, output_format, skip_processed):
         """Run the video processing (to be called in a separate thread)."""
         try:
-            # Configure progress reporting
+            # Imported here, on the worker thread, because it pulls in torch and Whisper;
+            # the window opens without waiting for them
+            from whisper_batch.main import collect_media_files, process_videos
+            
+            # Configure progress reporting; updates closer together than PROGRESS_MIN_INTERVAL
+            # only keep the latest, which is posted with the next one or before the end
+            last_posted = [0.0]
+            pending = [None]
+            
             def progress_callback(current, total, filename=""):
-                self.progress_queue.put((current, total, filename))
+                # process_videos treats a falsy return value as a cancellation
+                if self._stop_event.is_set():
+                    return False
+                    
+                now = time.monotonic()
+                if now - last_posted[0] < PROGRESS_MIN_INTERVAL and current != total:
+                    pending[0] = (current, total, filename)
+                    return True
+                last_posted[0] = now
+                pending[0] = None
+                self._post_progress((current, total, filename))
+                return True
             
-            # Count files to process
-            video_files = file_handler.find_video_files(input_dir)
+            def flush_pending_progress():
+                if pending[0] is not None:
+                    self._post_progress(pending[0])
+                    pending[0] = None
+            
+            # Count files to process; the list is handed to process_videos so the
+            # directory is walked only once
+            video_files = collect_media_files(input_dir, output_dir, output_format)
             if not video_files:
-                self.progress_queue.put(("error", "No video files found in the selected directory."))
+                self._post_progress(("error", "No video files found in the selected directory."))
                 return
             
             # Before processing, check for potential issues
             if device == "cuda":
                 # Log CUDA version and device information
-                import torch
-                
-                if not torch.cuda.is_available():
-                    logger.warning("CUDA not available despite being requested. Will use CPU instead.")
-                    device = "cpu"
-                else:
-                    try:
-                        # Test CUDA initialization
-                        device_name = torch.cuda.get_device_name(0)
-                        logger.info(f"Using CUDA device: {device_name}")
-                    except Exception as e:
-                        logger.warning(f"CUDA initialization error: {e}")
-                        logger.warning("Falling back to CPU. If you need GPU acceleration, make sure CUDA is properly installed.")
+                try:
+                    # Test CUDA initialization
+                    cuda_available, devices = _cuda_info()
+                    if not cuda_available:
+                        logger.warning("CUDA not available despite being requested. Will use CPU instead.")
                         device = "cpu"
+                    else:
+                        logger.info(f"Using CUDA device: {devices[0][0]}")
+                except Exception as e:
+                    logger.warning(f"CUDA initialization error: {e}")
+                    logger.warning("Falling back to CPU. If you need GPU acceleration, make sure CUDA is properly installed.")
+                    device = "cpu"
             
             # Log FFmpeg version
-            import shutil
-            import subprocess
-            ffmpeg_path = shutil.which("ffmpeg")
+            ffmpeg_path, ffmpeg_version = _ffmpeg_info()
             if not ffmpeg_path:
                 error_msg = "FFmpeg not found in PATH. Cannot process videos."
                 logger.error(error_msg)
-                self.progress_queue.put(("error", error_msg))
+                self._post_progress(("error", error_msg))
                 return
-            else:
-                try:
-                    result = subprocess.run(["ffmpeg", "-version"], capture_output=True, text=True, check=True)
-                    ffmpeg_version = result.stdout.split('\n')[0]
-                    logger.info(f"Using {ffmpeg_version}")
-                except Exception as e:
-                    logger.warning(f"Error checking FFmpeg version: {e}")
+            elif ffmpeg_version:
+                logger.info(f"Using {ffmpeg_version}")
             
             # Call the processing function
             try:
@@ -359,42 +505,77 @@ class WhisperBatchGUI(tk.Tk):
                     model_size=model_size,
                     language=language,
                     device=device,
-                    compute_type="default",
+                    compute_type="auto",
                     output_format=output_format,
                     skip_processed=skip_processed,
-                    progress_callback=progress_callback
+                    progress_callback=progress_callback,
+                    files=video_files
                 )
                 
                 # Signal completion
-                self.progress_queue.put(("complete", None))
+                flush_pending_progress()
+                self._post_progress(("cancelled", None) if self._stop_event.is_set() else ("complete", None))
             except Exception as e:
                 logger.error(f"Error during video processing: {e}", exc_info=True)
                 error_message = str(e)
                 
                 # Check for specific error types and provide more helpful messages
-                error_lower = error_message.lower()
-                if "cuda" in error_lower or "gpu" in error_lower or "cudnn" in error_lower:
-                    error_message = f"GPU error: {error_message}\n\nTry running with CPU mode enabled (uncheck 'Use GPU')."
-                elif "ffmpeg" in error_lower:
-                    error_message = f"FFmpeg error: {error_message}\n\nMake sure FFmpeg is properly installed and in your PATH."
-                elif "permission" in error_lower or "access" in error_lower:
-                    error_message = f"File access error: {error_message}\n\nCheck if you have permissions to access the input/output directories."
+                for pattern, template in _ERROR_CATEGORIES:
+                    if pattern.search(error_message):
+                        error_message = template.format(msg=error_message)
+                        break
                 
-                self.progress_queue.put(("error", error_message))
+                flush_pending_progress()
+                self._post_progress(("error", error_message))
             
         except Exception as e:
             # Signal error
             logger.error(f"Error during processing setup: {e}", exc_info=True)
-            self.progress_queue.put(("error", str(e)))
+            self._post_progress(("error", str(e)))
     
     def _show_error_dialog(self, title, message, details=None):
         """Show an enhanced error dialog with optional details."""
-        error_dialog = tk.Toplevel(self)
+        # The dialog is built on first use and hidden, not destroyed, when closed
+        if self._error_dialog is None:
+            self._build_error_dialog()
+        error_dialog = self._error_dialog
+        
         error_dialog.title(title)
+        self._error_message_label.config(text=message)
+        
+        # Details in scrolled text if provided
+        self._error_details = details
+        if details:
+            self._error_details_text.configure(state="normal")
+            self._error_details_text.delete("1.0", tk.END)
+            self._error_details_text.insert(tk.END, details)
+            self._error_details_text.configure(state="disabled")
+            self._error_details_frame.grid()
+        else:
+            self._error_details_frame.grid_remove()
+        
+        # Center the dialog on the main window
+        error_dialog.deiconify()
+        error_dialog.update_idletasks()
+        width = error_dialog.winfo_width()
+        height = error_dialog.winfo_height()
+        x = self.winfo_rootx() + (self.winfo_width() - width) // 2
+        y = self.winfo_rooty() + (self.winfo_height() - height) // 2
+        error_dialog.geometry(f"{width}x{height}+{x}+{y}")
+        error_dialog.grab_set()  # Modal
+        
+        # Wait for the dialog to be closed
+        self._error_dialog_closed.set(False)
+        self.wait_variable(self._error_dialog_closed)
+    
+    def _build_error_dialog(self):
+        """Create the error dialog widgets, hidden until _show_error_dialog fills them in."""
+        error_dialog = tk.Toplevel(self)
+        error_dialog.withdraw()
         error_dialog.geometry("500x400")
         error_dialog.minsize(400, 300)
         error_dialog.transient(self)  # Set to be on top of the main window
-        error_dialog.grab_set()  # Modal
+        error_dialog.protocol("WM_DELETE_WINDOW", self._close_error_dialog)
         
         # Make dialog resizable
         error_dialog.columnconfigure(0, weight=1)
@@ -413,34 +594,31 @@ class WhisperBatchGUI(tk.Tk):
             except:
                 pass
         
-        ttk.Label(header_frame, text=message, wraplength=400).pack(side=tk.LEFT, padx=5)
+        self._error_message_label = ttk.Label(header_frame, wraplength=400)
+        self._error_message_label.pack(side=tk.LEFT, padx=5)
         
-        # Details in scrolled text if provided
-        if details:
-            details_frame = ttk.LabelFrame(error_dialog, text="Details")
-            details_frame.grid(row=1, column=0, sticky="nsew", padx=10, pady=(0, 10))
-            
-            details_frame.columnconfigure(0, weight=1)
-            details_frame.rowconfigure(0, weight=1)
-            
-            details_text = tk.Text(details_frame, wrap=tk.WORD, width=60, height=10)
-            details_text.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
-            
-            scrollbar = ttk.Scrollbar(details_frame, command=details_text.yview)
-            scrollbar.grid(row=0, column=1, sticky="ns", pady=5)
-            details_text.configure(yscrollcommand=scrollbar.set)
-            
-            details_text.insert(tk.END, details)
-            details_text.configure(state="disabled")
-            
-            # Add a "Copy to Clipboard" button
-            def copy_to_clipboard():
-                self.clipboard_clear()
-                self.clipboard_append(details)
-                self.update()  # Required for clipboard to work
-            
-            ttk.Button(details_frame, text="Copy to Clipboard", command=copy_to_clipboard).grid(
-                row=1, column=0, columnspan=2, pady=5)
+        # Details in scrolled text, shown when there are details
+        details_frame = ttk.LabelFrame(error_dialog, text="Details")
+        details_frame.grid(row=1, column=0, sticky="nsew", padx=10, pady=(0, 10))
+        
+        details_frame.columnconfigure(0, weight=1)
+        details_frame.rowconfigure(0, weight=1)
+        
+        details_text = tk.Text(details_frame, wrap=tk.WORD, width=60, height=10, state="disabled")
+        details_text.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
+        
+        scrollbar = ttk.Scrollbar(details_frame, command=details_text.yview)
+        scrollbar.grid(row=0, column=1, sticky="ns", pady=5)
+        details_text.configure(yscrollcommand=scrollbar.set)
+        
+        # Add a "Copy to Clipboard" button
+        def copy_to_clipboard():
+            self.clipboard_clear()
+            self.clipboard_append(self._error_details or "")
+            self.update()  # Required for clipboard to work
+        
+        ttk.Button(details_frame, text="Copy to Clipboard", command=copy_to_clipboard).grid(
+            row=1, column=0, columnspan=2, pady=5)
         
         # Buttons at the bottom
         button_frame = ttk.Frame(error_dialog)
@@ -448,15 +626,12 @@ class WhisperBatchGUI(tk.Tk):
         
         # View log button (shows log file location)
         def view_log():
-            import os
-            from pathlib import Path
             # Get log directory from setup_logging
             logs_dir = Path.home() / 'whisper_batch_logs'
             if logs_dir.exists():
                 if hasattr(os, 'startfile'):  # Windows
                     os.startfile(logs_dir)
                 elif os.name == 'posix':  # macOS and Linux
-                    import subprocess
                     try:
                         subprocess.run(['xdg-open', logs_dir])  # Linux
                     except FileNotFoundError:
@@ -467,25 +642,30 @@ class WhisperBatchGUI(tk.Tk):
         
         ttk.Button(button_frame, text="View Logs", command=view_log).pack(side=tk.LEFT, padx=5)
         
-        # OK button (closes the dialog)
-        ttk.Button(button_frame, text="OK", command=error_dialog.destroy).pack(side=tk.RIGHT, padx=5)
-        
-        # Center the dialog on the main window
-        error_dialog.update_idletasks()
-        width = error_dialog.winfo_width()
-        height = error_dialog.winfo_height()
-        x = self.winfo_rootx() + (self.winfo_width() - width) // 2
-        y = self.winfo_rooty() + (self.winfo_height() - height) // 2
-        error_dialog.geometry(f"{width}x{height}+{x}+{y}")
+        # OK button (hides the dialog for reuse)
+        ttk.Button(button_frame, text="OK", command=self._close_error_dialog).pack(side=tk.RIGHT, padx=5)
         
-        # Wait for the dialog to be closed
-        error_dialog.wait_window()
+        self._error_dialog = error_dialog
+        self._error_details_frame = details_frame
+        self._error_details_text = details_text
+    
+    def _close_error_dialog(self):
+        """Hide the error dialog and release the caller waiting in _show_error_dialog."""
+        self._error_dialog.grab_release()
+        self._error_dialog.withdraw()
+        self._error_dialog_closed.set(True)
 
-    def _check_progress(self):
-        """Check the progress queue and update the UI accordingly."""
+    def _poll_progress(self):
+        """Drain the progress queue periodically while processing, in case an event was lost."""
+        self._drain_progress()
+        if self.is_processing:
+            self.after(PROGRESS_POLL_INTERVAL_MS, self._poll_progress)
+    
+    def _drain_progress(self, event=None):
+        """Handle the queued progress messages and update the UI accordingly."""
         try:
-            while not self.progress_queue.empty():
-                msg = self.progress_queue.get_nowait()
+            while self.progress_queue:
+                msg = self.progress_queue.popleft()
                 
                 if msg[0] == "complete":
                     # Processing completed
@@ -495,22 +675,23 @@ class WhisperBatchGUI(tk.Tk):
                     messagebox.showinfo("Complete", "Transcription process has completed successfully!")
                     return
                 
+                elif msg[0] == "cancelled":
+                    # Worker stopped after a cancel request
+                    self.status_label.config(text="Transcription cancelled")
+                    self._reset_processing_state()
+                    return
+                
                 elif msg[0] == "error":
                     # Error occurred
                     error_message = msg[1]
                     self.status_label.config(text=f"Error: {error_message[:50]}..." if len(error_message) > 50 else f"Error: {error_message}")
                     self._reset_processing_state()
                     
-                    # Get the last few lines from the log for details
-                    import traceback
-                    details = f"Error: {error_message}\n\n"
-                    details += "Please check the log file for more details.\n"
-                    
                     # Show the enhanced error dialog
                     self._show_error_dialog(
                         title="Transcription Error",
                         message="An error occurred during the transcription process.",
-                        details=details
+                        details=_ERROR_DETAILS_TEMPLATE.format(msg=error_message)
                     )
                     return
                 
@@ -523,22 +704,15 @@ class WhisperBatchGUI(tk.Tk):
         
         except Exception as e:
             logger.error(f"Error checking progress: {e}", exc_info=True)
-        
-        # Schedule the next check if still processing
-        if self.is_processing:
-            self.after(100, self._check_progress)
     
     def _cancel_transcription(self):
         """Cancel the transcription process."""
         if self.is_processing:
-            # Set a flag or signal to stop the processing
-            # (Would need to modify process_videos to check for cancellation)
+            # The worker stops before its next file and then posts "cancelled"
             logger.info("Cancelling transcription...")
             self.status_label.config(text="Cancelling...")
-            
-            # For now, just reset the state 
-            # In a real implementation, you'd need proper cancellation support
-            self._reset_processing_state()
+            self.cancel_button.config(state=tk.DISABLED)
+            self._stop_event.set()
     
     def _reset_processing_state(self):
         """Reset the UI state after processing is done or cancelled."""
@@ -548,22 +722,25 @@ class WhisperBatchGUI(tk.Tk):
     
     def _validate_inputs(self):
         """Validate the user inputs before starting processing."""
+        input_dir = self.input_dir.get()
+        output_dir = self.output_dir.get()
+        
         # Check if input directory exists
-        if not self.input_dir.get():
+        if not input_dir:
             messagebox.showerror("Error", "Please select an input directory.")
             return False
         
-        if not os.path.isdir(self.input_dir.get()):
+        if not Path(input_dir).is_dir():
             messagebox.showerror("Error", "The specified input directory does not exist.")
             return False
         
         # Check if output directory is specified
-        if not self.output_dir.get():
+        if not output_dir:
             messagebox.showerror("Error", "Please specify an output directory.")
             return False
         
         # Create output directory if it doesn't exist
-        os.makedirs(self.output_dir.get(), exist_ok=True)
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
         
         return True
     
@@ -572,6 +749,12 @@ class WhisperBatchGUI(tk.Tk):
         if self.is_processing:
             if messagebox.askyesno("Confirm Exit", "A transcription is currently running. Are you sure you want to exit?"):
                 self._cancel_transcription()
+                
+                # Give the worker a chance to finish its current file and release the model;
+                # while the Tk loop waits here, the worker must not call into Tk
+                self._closing = True
+                logging.getLogger().removeHandler(self._log_handler)
+                self.process_thread.join(timeout=5.0)
                 self.destroy()
         else:
             self.destroy()
@@ -8,16 +8,88 @@ __version__ = '0.1.0'
 __author__ = 'Your Name'
 
 # Configure shared logging format
+import atexit
 import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import os
 from pathlib import Path
+import queue
 import sys
+import time
 import traceback
 from datetime import datetime
 
 # Standard logging format to be used across all modules
 DEFAULT_LOG_FORMAT = '%(asctime)s - %(levelname)s - [%(module)s] %(message)s'
 
+# Log file size cap and number of rotated files kept
+LOG_FILE_MAX_BYTES = 10_000_000
+LOG_FILE_BACKUP_COUNT = 3
+
+# Write buffer of the log file, and the records written between flushes
+# (errors are flushed at once)
+LOG_FILE_WRITE_BUFFER = 1 << 20
+LOG_FILE_FLUSH_RECORDS = 64
+
+# Names given to the handlers setup_logging installs
+CONSOLE_HANDLER_NAME = 'whisper_batch_console'
+FILE_HANDLER_NAME = 'whisper_batch_file'
+QUEUE_HANDLER_NAME = 'whisper_batch_queue'
+
+# Unhandled exceptions are also appended here, for easier access
+ERROR_LOG_FILE = Path.home() / 'whisper_batch_error.log'
+
+# Set once setup_logging has run; later calls return the same log file
+_LOGGING_CONFIGURED = False
+_CURRENT_LOG_FILE = None
+
+# Writes the queued records to the handlers setup_logging creates
+_LOG_LISTENER = None
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that writes through a large buffer and flushes in batches.
+    
+    The stock handler flushes after every record and, to decide on rollover, stats
+    the file and seeks to its end (which flushes again) per record. This one keeps
+    count of the characters written instead and flushes every
+    LOG_FILE_FLUSH_RECORDS records or on an error.
+    """
+    
+    def __init__(self, filename, maxBytes=0, backupCount=0, encoding=None):
+        self._size = 0
+        self._unflushed = 0
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, encoding=encoding)
+        
+    def _open(self):
+        stream = open(self.baseFilename, self.mode, encoding=self.encoding, errors=self.errors,
+                      buffering=LOG_FILE_WRITE_BUFFER)
+        self._size = os.path.getsize(self.baseFilename)
+        return stream
+    
+    def emit(self, record):
+        try:
+            msg = self.format(record) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+            if self.maxBytes > 0 and self._size + len(msg) >= self.maxBytes:
+                self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+            self.stream.write(msg)
+            self._size += len(msg)
+            self._unflushed += 1
+            if record.levelno >= logging.ERROR or self._unflushed >= LOG_FILE_FLUSH_RECORDS:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def flush(self):
+        super().flush()
+        self._unflushed = 0
+
 # Setup logging with file output
 def setup_logging(log_to_file=True, log_level=logging.INFO):
     """
@@ -27,43 +99,72 @@ def setup_logging(log_to_file=True, log_level=logging.INFO):
         log_to_file: Whether to log to a file in addition to console.
         log_level: The logging level to use.
         
+    Only the first call configures logging; later calls keep the existing
+    handlers and log file. Records are queued by the logging threads and
+    written to the console and files by a single listener thread.
+    
     Returns:
         The path to the log file if created, None otherwise.
     """
+    global _LOGGING_CONFIGURED, _CURRENT_LOG_FILE, _LOG_LISTENER
+    if _LOGGING_CONFIGURED:
+        return _CURRENT_LOG_FILE
+    
     # Create root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
     
-    # Clear any existing handlers
+    # Remove our own handlers and the plain console handler logging.basicConfig()
+    # installs; handlers added by others (pytest, IDEs) are left in place
     for handler in root_logger.handlers[:]:
-        root_logger.removeHandler(handler)
+        if (handler.get_name() in (CONSOLE_HANDLER_NAME, FILE_HANDLER_NAME, QUEUE_HANDLER_NAME)
+                or type(handler) is logging.StreamHandler):
+            root_logger.removeHandler(handler)
     
     # Create console handler
     console_handler = logging.StreamHandler()
+    console_handler.set_name(CONSOLE_HANDLER_NAME)
     console_handler.setLevel(log_level)
     console_formatter = logging.Formatter(DEFAULT_LOG_FORMAT)
     console_handler.setFormatter(console_formatter)
-    root_logger.addHandler(console_handler)
+    handlers = [console_handler]
     
     log_file_path = None
     if log_to_file:
-        # Create logs directory if it doesn't exist
+        # Create logs directory if it doesn't exist (once per process, see _LOGGING_CONFIGURED)
         logs_dir = Path.home() / 'whisper_batch_logs'
         logs_dir.mkdir(exist_ok=True)
         
         # Create log file with timestamp
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        timestamp = time.strftime('%Y%m%d_%H%M%S')
         log_file_path = logs_dir / f'whisper_batch_{timestamp}.log'
         
-        # Create file handler
-        file_handler = logging.FileHandler(log_file_path, encoding='utf-8')
+        # Create file handler; logging.shutdown() flushes its buffer at exit
+        file_handler = BufferedRotatingFileHandler(log_file_path, encoding='utf-8',
+                                                   maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUP_COUNT)
         file_handler.setLevel(log_level)
         file_formatter = logging.Formatter(DEFAULT_LOG_FORMAT)
         file_handler.setFormatter(file_formatter)
-        root_logger.addHandler(file_handler)
-        
+        file_handler.set_name(FILE_HANDLER_NAME)
+        handlers.append(file_handler)
+    
+    # Worker threads only enqueue their records; the listener thread does all the
+    # formatting and I/O, so workers never wait on each other's console or file writes
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.set_name(QUEUE_HANDLER_NAME)
+    root_logger.addHandler(queue_handler)
+    _LOG_LISTENER = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _LOG_LISTENER.start()
+    # Registered after logging's own exit hook, so this runs first: the queue is
+    # drained before logging.shutdown() flushes and closes the handlers
+    atexit.register(_LOG_LISTENER.stop)
+    
+    if log_file_path:
         logging.info(f"Log file created at: {log_file_path}")
     
+    _LOGGING_CONFIGURED = True
+    _CURRENT_LOG_FILE = log_file_path
     return log_file_path
 
 # Global exception handler
@@ -80,10 +181,10 @@ def handle_exception(exc_type, exc_value, exc_traceback):
     logger = logging.getLogger(__name__)
     logger.critical("Unhandled exception", exc_info=(exc_type, exc_value, exc_traceback))
     
-    # Write to error file for easier access
-    error_file = Path.home() / 'whisper_batch_error.log'
+    # Write to error file for easier access; written directly, so crashes before
+    # setup_logging has run are recorded too
     try:
-        with open(error_file, 'a', encoding='utf-8') as f:
+        with open(ERROR_LOG_FILE, 'a', encoding='utf-8') as f:
             timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             f.write(f"\n\n--- UNHANDLED EXCEPTION [{timestamp}] ---\n")
             traceback.print_exception(exc_type, exc_value, exc_traceback, file=f)
@@ -1,9 +1,13 @@
 import ffmpeg
+import functools
+import numpy as np
 from pathlib import Path
 import logging
 import tempfile
 import os
 import shutil
+import subprocess
+import threading
 
 # Use shared logging configuration from the package
 from whisper_batch import DEFAULT_LOG_FORMAT
@@ -12,7 +16,41 @@ from whisper_batch import DEFAULT_LOG_FORMAT
 if not logging.getLogger().handlers:
     logging.basicConfig(level=logging.INFO, format=DEFAULT_LOG_FORMAT)
 
-def extract_audio(video_path: Path, output_dir: Path | None = None) -> Path | None:
+# Whisper's input format: 16 kHz mono, streamed from FFmpeg as 16-bit PCM
+SAMPLE_RATE = 16000
+PCM_SCALE = np.float32(1.0 / 32768.0)
+
+@functools.lru_cache(maxsize=1)
+def _ffmpeg_path() -> str | None:
+    """Looks FFmpeg up on the PATH once per session."""
+    return shutil.which("ffmpeg")
+
+# Buffer size for FFmpeg's pipes, and the size of each read from its stdout
+PIPE_BUFSIZE = 1 << 20
+
+def _drain_stderr(process: subprocess.Popen) -> tuple[threading.Thread, bytearray]:
+    """
+    Collects a process's stderr on a daemon thread, so FFmpeg never stalls on a full pipe.
+
+    Returns:
+        The draining thread (join it before reading) and the buffer it fills.
+    """
+    captured = bytearray()
+
+    def drain():
+        fd = process.stderr.fileno()
+        while True:
+            data = os.read(fd, 65536)
+            if not data:
+                break
+            captured.extend(data)
+
+    thread = threading.Thread(target=drain, daemon=True)
+    thread.start()
+    return thread, captured
+
+def extract_audio(video_path: Path, output_dir: Path | None = None,
+                  hwaccel: str | None = None, threads: int = 0) -> Path | None:
     """
     Extracts audio from a video file using FFmpeg and saves it as a WAV file.
 
@@ -20,18 +58,21 @@ def extract_audio(video_path: Path, output_dir: Path | None = None) -> Path | No
         video_path: Path to the input video file.
         output_dir: Optional directory to save the audio file. If None,
                     a temporary directory is used.
+        hwaccel: Optional FFmpeg hardware decoder (e.g. 'cuda'). Only matters when
+                 video frames are decoded; plain audio extraction skips video.
+        threads: FFmpeg thread count for decoding and encoding (0 = automatic).
 
     Returns:
         The Path object of the extracted audio file (WAV format),
         or None if extraction fails.
     """
     # Check if FFmpeg is installed and available
-    if not shutil.which("ffmpeg"):
+    if not _ffmpeg_path():
         logging.error("FFmpeg is not installed or not in the system PATH.")
         logging.error("Please install FFmpeg (https://ffmpeg.org/download.html) and make sure it's in your PATH.")
         return None
 
-    if not video_path.is_file():
+    if not os.path.isfile(video_path):
         logging.error(f"Video file not found: {video_path}")
         return None
 
@@ -52,20 +93,33 @@ def extract_audio(video_path: Path, output_dir: Path | None = None) -> Path | No
 
         logging.info(f"Extracting audio from '{video_path.name}' to '{audio_output_path}'...")
 
+        input_options = {'threads': threads}
+        if hwaccel:
+            input_options['hwaccel'] = hwaccel
+
         # FFmpeg command based on product doc recommendation
-        (
+        stream = (
             ffmpeg
-            .input(str(video_path))
+            .input(str(video_path), **input_options)
             .output(
                 str(audio_output_path),
                 ac=1,          # Mono channel
                 ar=16000,      # 16kHz sample rate
                 vn=None,       # No video output
-                acodec='pcm_s16le' # Standard WAV codec
+                acodec='pcm_s16le', # Standard WAV codec
+                threads=threads,
+                loglevel='error' # Only errors on stderr, which is all we report
             )
             .overwrite_output() # Overwrite if exists (useful for reruns/temp files)
-            .run(capture_stdout=True, capture_stderr=True, quiet=True) # Use quiet=True to suppress ffmpeg console output
         )
+        process = subprocess.Popen(ffmpeg.compile(stream), stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.PIPE, bufsize=PIPE_BUFSIZE)
+        stderr_thread, stderr = _drain_stderr(process)
+        returncode = process.wait()
+        stderr_thread.join()
+        process.stderr.close()
+        if returncode != 0:
+            raise ffmpeg.Error('ffmpeg', None, bytes(stderr))
 
         logging.info(f"Successfully extracted audio to: {audio_output_path}")
         return audio_output_path
@@ -95,4 +149,84 @@ def extract_audio(video_path: Path, output_dir: Path | None = None) -> Path | No
                  logging.debug(f"Cleaned up temporary audio file: {audio_output_path}")
              except OSError as rm_err:
                  logging.error(f"Failed to remove temporary audio file {audio_output_path}: {rm_err}")
-        return None 
\ No newline at end of file
+        return None
+
+
+def extract_audio_to_array(video_path: Path, threads: int = 0) -> np.ndarray | None:
+    """
+    Decodes the audio of a media file straight into memory, without a WAV file.
+
+    FFmpeg streams 16 kHz mono PCM through a pipe into a growing buffer, which
+    is then converted to Whisper's float32 samples in one pass.
+
+    Args:
+        video_path: Path to the input media file.
+        threads: FFmpeg thread count for decoding (0 = automatic).
+
+    Returns:
+        The samples as a float32 array in [-1, 1), or None if decoding fails.
+    """
+    if not _ffmpeg_path():
+        logging.error("FFmpeg is not installed or not in the system PATH.")
+        logging.error("Please install FFmpeg (https://ffmpeg.org/download.html) and make sure it's in your PATH.")
+        return None
+
+    if not os.path.isfile(video_path):
+        logging.error(f"Media file not found: {video_path}")
+        return None
+
+    try:
+        # Grown by doubling as the stream comes in; probing the duration up front
+        # to size it would cost an ffprobe process per file
+        buffer = bytearray(PIPE_BUFSIZE)
+
+        stream = (
+            ffmpeg
+            .input(str(video_path), threads=threads)
+            .output(
+                'pipe:',
+                format='s16le',
+                acodec='pcm_s16le',
+                ac=1,
+                ar=SAMPLE_RATE,
+                threads=threads,
+                loglevel='error'
+            )
+        )
+        process = subprocess.Popen(ffmpeg.compile(stream), stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE, bufsize=PIPE_BUFSIZE)
+        stderr_thread, stderr = _drain_stderr(process)
+
+        finished = False
+        try:
+            size = 0
+            with process.stdout:
+                while True:
+                    if len(buffer) - size < PIPE_BUFSIZE:
+                        buffer.extend(bytes(max(len(buffer), PIPE_BUFSIZE)))
+                    with memoryview(buffer)[size:size + PIPE_BUFSIZE] as chunk:
+                        read = process.stdout.readinto(chunk)
+                    if not read:
+                        break
+                    size += read
+            finished = True
+        finally:
+            if not finished:
+                # Reading failed (e.g. MemoryError growing the buffer); don't leave
+                # FFmpeg decoding a file nobody reads any more
+                process.kill()
+            returncode = process.wait()
+            stderr_thread.join()
+            process.stderr.close()
+        if returncode != 0:
+            logging.error(f"FFmpeg error decoding audio from {video_path}:")
+            logging.error(f"FFmpeg stderr: {stderr.decode('utf-8', errors='replace')}")
+            return None
+
+        audio = np.frombuffer(buffer, np.int16, count=size // 2).astype(np.float32)
+        audio *= PCM_SCALE
+        return audio
+
+    except Exception as e:
+        logging.error(f"Unexpected error decoding audio from {video_path}: {e}")
+        return None
@@ -12,6 +12,30 @@ if not logging.getLogger().handlers:
 # Define supported video file extensions (add more as needed)
 SUPPORTED_VIDEO_EXTENSIONS = {".mp4", ".mkv", ".avi", ".mov", ".wmv", ".flv"}
 
+# Audio and video extensions the transcriber accepts
+MEDIA_EXTENSIONS = frozenset({".mp4", ".avi", ".mov", ".mkv", ".webm", ".mp3", ".wav", ".m4a", ".flac"})
+
+def _scan_files(root, extensions):
+    """
+    Yield the files under root whose lower-cased extension is in extensions, in one pass.
+
+    Walks with os.scandir: the entry types come with the directory listing, so
+    rejected entries are never stat()ed and Path objects are built only for matches.
+    """
+    pending_dirs = [root]
+    while pending_dirs:
+        try:
+            with os.scandir(pending_dirs.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending_dirs.append(entry.path)
+                        continue
+                    # splitext gives a bare '.mp4' no extension, like Path.suffix
+                    if os.path.splitext(entry.name)[1].lower() in extensions and entry.is_file():
+                        yield Path(entry.path)
+        except OSError as e:
+            logging.warning(f"Could not scan directory: {e}")
+
 def find_video_files(input_dir: Path) -> list[Path]:
     """
     Recursively finds all video files in the input directory.
@@ -28,9 +52,10 @@ def find_video_files(input_dir: Path) -> list[Path]:
         return []
 
     logging.info(f"Scanning for video files in: {input_dir}")
-    for item in input_dir.rglob('*'): # rglob searches recursively
-        if item.is_file() and item.suffix.lower() in SUPPORTED_VIDEO_EXTENSIONS:
-            video_files.append(item)
+    log_each_file = logging.getLogger().isEnabledFor(logging.DEBUG)
+    for item in _scan_files(input_dir, SUPPORTED_VIDEO_EXTENSIONS):
+        video_files.append(item)
+        if log_each_file:
             logging.debug(f"Found video file: {item}")
 
     if not video_files:
@@ -40,6 +65,15 @@ def find_video_files(input_dir: Path) -> list[Path]:
 
     return video_files
 
+def is_media_file(file_path):
+    """Check if a file is a media file that can be processed."""
+    return os.path.splitext(file_path)[1].lower() in MEDIA_EXTENSIONS
+
+def get_media_files(directory_path):
+    """Get all media files from a directory, recursively."""
+    # One walk for all extensions (case-insensitive), directories named like media skipped
+    return list(_scan_files(Path(directory_path), MEDIA_EXTENSIONS))
+
 if __name__ == '__main__':
     # Example usage for testing
     test_dir = Path('.') # Replace with a directory containing test videos
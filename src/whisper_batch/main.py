@@ -1,25 +1,28 @@
 import argparse
+import itertools
+import json
 import logging
 from pathlib import Path
 import os
 import sys
-from tqdm import tqdm
-from datetime import timedelta
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Union, List, Tuple
+from typing import Union, List, Optional, Tuple
 import time
 
 # Ensure the src directory is in the Python path
 # This allows importing modules from whisper_batch
 project_root = Path(__file__).resolve().parent.parent.parent
-sys.path.insert(0, str(project_root / 'src'))
+src_path = str(project_root / 'src')
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
 
 try:
     # Use shared logging configuration from the package
     from whisper_batch import DEFAULT_LOG_FORMAT
-    from whisper_batch.file_handler import find_video_files, SUPPORTED_VIDEO_EXTENSIONS
-    from whisper_batch.audio_extractor import extract_audio
-    from whisper_batch.transcriber import load_transcription_model, transcribe_file, is_media_file, get_media_files
+    # The transcriber (torch, whisper) is imported by process_videos, so argument
+    # parsing and file listing don't pay for it
+    from whisper_batch.file_handler import is_media_file, get_media_files
 except ImportError as e:
     print(f"Error importing modules: {e}")
     print("Ensure you are running from the project root or the script can find the 'src' directory.")
@@ -50,27 +53,27 @@ def create_output_path(input_video_path: Path, input_base_dir: Path, output_base
     output_file_path = output_path.with_suffix(f".{output_format}")
     return output_file_path
 
-def format_timestamp(seconds: float, always_include_hours: bool = False) -> str:
+def format_timestamp(seconds: float, always_include_hours: bool = True) -> str:
     """
     Format seconds into an SRT timestamp (HH:MM:SS,mmm).
     
     Args:
         seconds: The time in seconds.
-        always_include_hours: Whether to always include the hours part.
+        always_include_hours: Whether to always include the hours part; SRT
+            requires it, without it the hours are only shown when non-zero.
     
     Returns:
         A string formatted as an SRT timestamp.
     """
-    hours = int(seconds // 3600)
-    seconds %= 3600
-    minutes = int(seconds // 60)
-    seconds %= 60
-    milliseconds = int(seconds * 1000) % 1000
-    
-    if always_include_hours or hours > 0:
-        return f"{hours:02d}:{minutes:02d}:{int(seconds):02d},{milliseconds:03d}"
-    else:
-        return f"{minutes:02d}:{int(seconds):02d},{milliseconds:03d}"
+    # Whole milliseconds once, then integer math only, so no float rounding
+    # creeps into the minutes and seconds
+    milliseconds = int(seconds * 1000.0)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    if always_include_hours or hours:
+        return "%02d:%02d:%02d,%03d" % (hours, minutes, seconds, milliseconds)
+    return "%02d:%02d,%03d" % (minutes, seconds, milliseconds)
 
 def format_srt(segments) -> str:
     """
@@ -82,35 +85,163 @@ def format_srt(segments) -> str:
     Returns:
         A string containing the SRT formatted subtitles.
     """
-    srt_content = []
-    for i, segment in enumerate(segments, start=1):
-        # Format: subtitle number
-        srt_content.append(str(i))
-        
-        # Format: start time --> end time
-        start_time = format_timestamp(segment.start, always_include_hours=True)
-        end_time = format_timestamp(segment.end, always_include_hours=True)
-        srt_content.append(f"{start_time} --> {end_time}")
+    # One block per segment (number, times, text, blank separator), joined once
+    return "\n".join([
+        f"{i}\n{format_timestamp(segment.start)} --> {format_timestamp(segment.end)}\n{segment.text.strip()}\n"
+        for i, segment in enumerate(segments, start=1)
+    ])
+
+def collect_media_files(
+    input_path: Union[str, Path],
+    output_path: Union[str, Path],
+    output_format: str = "srt",
+    skip_processed: bool = False,
+    files: Optional[List[Path]] = None
+) -> List[Path]:
+    """
+    List the media files to transcribe, leaving out finished ones if requested.
+    
+    Args:
+        input_path: Path to input directory or single file
+        output_path: Path to output directory
+        output_format: Output format for transcriptions
+        skip_processed: Whether to leave out files whose output already exists
+        files: Media files under input_path, if already listed by the caller;
+            input_path is not walked again
+    
+    Returns:
+        The media files still to process
+    """
+    input_path = Path(input_path)
+    output_path = Path(output_path)
+    
+    # Collect video files to process
+    video_files = []
+    if files is not None:
+        video_files = [Path(video_file) for video_file in files]
+        if not video_files:
+            logging.warning(f"No media files found in {input_path}")
+            return []
+    elif input_path.is_file():
+        if is_media_file(input_path):
+            video_files = [input_path]
+        else:
+            logging.warning(f"The file {input_path} is not recognized as a media file.")
+            return []
+    else:
+        video_files = get_media_files(input_path)
+        if not video_files:
+            logging.warning(f"No media files found in {input_path}")
+            return []
+    
+    logging.info(f"Found {len(video_files)} media files to process")
+    
+    # Filter out already processed files if skip_processed is True
+    if skip_processed:
+        input_is_dir = input_path.is_dir()
+        filtered_files = []
+        for video_file in video_files:
+            rel_path = video_file.relative_to(input_path) if input_is_dir else Path(video_file.name)
+            output_file = output_path / rel_path.with_suffix(f".{output_format}")
+            if not output_file.exists():
+                filtered_files.append(video_file)
+            else:
+                logging.info(f"Skipping already processed file: {video_file}")
         
-        # Format: subtitle text
-        srt_content.append(segment.text.strip())
+        logging.info(f"After filtering: {len(filtered_files)} files to process (skipped {len(video_files) - len(filtered_files)})")
+        video_files = filtered_files
         
-        # Add an empty line between entries
-        srt_content.append("")
+    return video_files
+
+# Cache file under the output root recording which source and settings produced
+# each transcript, keyed by the transcript's path relative to the output root
+TRANSCRIPT_CACHE_NAME = ".whisper_batch_transcripts.json"
+
+def transcript_signature(video_file: Path, model_size: str, language: str, output_format: str) -> dict:
+    """
+    Describe a source file and the settings that affect its transcript.
+    
+    Args:
+        video_file: Path to the media file
+        model_size: Size of the Whisper model
+        language: Language code for transcription
+        output_format: Output format of the transcript
+    
+    Returns:
+        A JSON-serializable dict, recorded in the transcript cache once the transcript is written
+    """
+    stat = video_file.stat()
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "model_size": model_size,
+        "language": language,
+        "format": output_format,
+    }
+
+def load_transcript_cache(output_path: Path) -> dict:
+    """
+    Read the transcript records kept under output_path.
+    
+    Args:
+        output_path: Output root directory
+    
+    Returns:
+        The transcript_signature of each transcript's source, keyed by the
+        transcript path relative to output_path; empty if there is no cache yet
+    """
+    try:
+        with open(output_path / TRANSCRIPT_CACHE_NAME, encoding="utf-8") as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_transcript_cache(output_path: Path, cache: dict) -> None:
+    """
+    Write the transcript records under output_path, replacing the old file atomically.
     
-    return "\n".join(srt_content)
+    Args:
+        output_path: Output root directory
+        cache: Records as returned by load_transcript_cache
+    """
+    cache_path = output_path / TRANSCRIPT_CACHE_NAME
+    temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        # Without the records the files are just transcribed again next time
+        logging.warning(f"Could not write {cache_path}: {e}")
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
 
 def process_videos(
     input_path: Union[str, Path], 
     output_path: Union[str, Path], 
     model_size: str = "base.en", 
     device: str = "auto", 
-    compute_type: str = "default", 
+    compute_type: str = "auto", 
     output_format: str = "srt", 
     max_workers: int = 1,
     language: str = "en",
     skip_processed: bool = False,
-    progress_callback = None
+    progress_callback = None,
+    model = None,
+    device_indices: Optional[List[int]] = None,
+    use_batched: bool = False,
+    batch_size: int = 16,
+    fast_preset: bool = False,
+    files: Optional[List[Path]] = None,
+    extract_workers: int = 1,
+    force: bool = False,
+    backend: str = "openai-whisper",
+    vad: bool = True,
+    beam_size: int = 1,
+    compile_model: bool = False
 ) -> List[Tuple[str, bool, str]]:
     """
     Process videos in the input path and generate transcriptions.
@@ -120,121 +251,245 @@ def process_videos(
         output_path: Path to output directory
         model_size: Size of the Whisper model to use
         device: Device to use for inference (auto, cuda, cpu)
-        compute_type: Compute type to use
+        compute_type: Compute type to use (auto, default, float32, float16, int8, int8_float16);
+            auto picks float16/int8_float16 on the GPU and int8 on the CPU
         output_format: Output format for transcriptions
         max_workers: Maximum number of concurrent workers
         language: Language code for transcription
         skip_processed: Whether to skip already processed files
         progress_callback: Optional callback function for progress updates
+        model: Already loaded model to use instead of loading one (lets callers
+            reuse a model across runs)
+        device_indices: CUDA devices to spread the workers over (round-robin);
+            a passed-in model is assumed to be on the first of them
+        use_batched: Decode each file's 30s windows in batches instead of sequentially
+        batch_size: Number of windows per batch when use_batched is set
+        fast_preset: Greedy temperature-0 decoding without previous-text conditioning,
+            restricted to VAD speech regions, with repeated n-grams filtered out
+        files: Media files under input_path to process, if already listed by the
+            caller; input_path is not walked again
+        extract_workers: Number of files decoded to audio ahead of the transcription
+            workers, so decoding overlaps with the model (0 = each worker decodes
+            its own file)
+        force: Transcribe files again even if their transcript was already written
+            from the same source file and settings
+        backend: Inference backend for models loaded here (openai-whisper or
+            faster-whisper)
+        vad: Only transcribe the speech regions Silero VAD finds (not used in
+            batched mode)
+        beam_size: Beams searched per window; 1 decodes greedily (not used in
+            batched mode)
+        compile_model: Compile the openai-whisper model with torch.compile on CUDA
     
     Returns:
         A list of tuples containing (file_path, success, error_message)
     """
+    from whisper_batch.transcriber import (load_transcription_model, transcribe_media, transcribe_media_batched,
+                                           filter_repeated_segments, save_transcription, load_media_audio,
+                                           ensure_output_dir)
+    
     # Convert paths to Path objects
     input_path = Path(input_path)
     output_path = Path(output_path)
     
+    # Enumerate first, so a run with nothing left to do never loads a model
+    video_files = collect_media_files(input_path, output_path, output_format, skip_processed, files=files)
+    if not video_files:
+        return []
+    
+    def get_output_file(video_file):
+        # When input is a file, the output is named after just the filename
+        rel_path = video_file.relative_to(input_path) if input_path.is_dir() else Path(video_file.name)
+        return output_path / rel_path.with_suffix(f".{output_format}")
+    
+    def get_cache_key(video_file):
+        return get_output_file(video_file).relative_to(output_path).as_posix()
+    
+    # Source signatures, recorded in the transcript cache once a transcript is saved
+    transcript_cache = load_transcript_cache(output_path)
+    cache_changed = False
+    signatures = {}
+    results = []
+    pending_files = []
+    for video_file in video_files:
+        try:
+            signatures[video_file] = transcript_signature(video_file, model_size, language, output_format)
+        except OSError as e:
+            logging.error(f"Cannot read {video_file}: {e}")
+            results.append((str(video_file), False, str(e)))
+            continue
+        if (not force and transcript_cache.get(get_cache_key(video_file)) == signatures[video_file]
+                and get_output_file(video_file).exists()):
+            logging.info(f"Skipping up-to-date transcript for: {video_file}")
+            results.append((str(video_file), True, "cached"))
+        else:
+            pending_files.append(video_file)
+    video_files = pending_files
+    if not video_files:
+        logging.info("No files left to transcribe.")
+        return results
+    
     # Load the transcription model
-    logging.info(f"Loading transcription model: {model_size} on {device}")
-    model = load_transcription_model(model_size, device, compute_type)
+    if model is None:
+        logging.info(f"Loading transcription model: {model_size} on {device}")
+        model = load_transcription_model(model_size, device, compute_type,
+                                         device_index=device_indices[0] if device_indices else None,
+                                         backend=backend, compile_model=compile_model)
     
     if model is None:
         logging.error("Failed to load transcription model. Cannot proceed with transcription.")
         return []
     
     # Create output directory if it doesn't exist
-    if not output_path.exists():
-        output_path.mkdir(parents=True, exist_ok=True)
-    
-    # Collect video files to process
-    video_files = []
-    if input_path.is_file():
-        if is_media_file(input_path):
-            video_files = [input_path]
-        else:
-            logging.warning(f"The file {input_path} is not recognized as a media file.")
-            return []
-    else:
-        video_files = get_media_files(input_path)
-        if not video_files:
-            logging.warning(f"No media files found in {input_path}")
-            return []
+    ensure_output_dir(output_path)
     
-    logging.info(f"Found {len(video_files)} media files to process")
+    # Create the output subdirectories up front, once per distinct directory
+    # rather than once per file
+    for output_dir in {get_output_file(video_file).parent for video_file in video_files}:
+        ensure_output_dir(output_dir)
     
-    # Filter out already processed files if skip_processed is True
-    if skip_processed:
-        filtered_files = []
-        for video_file in video_files:
-            rel_path = video_file.relative_to(input_path) if input_path.is_dir() else video_file.name
-            output_file = output_path / rel_path.with_suffix(f".{output_format}")
-            if not output_file.exists():
-                filtered_files.append(video_file)
-            else:
-                logging.info(f"Skipping already processed file: {video_file}")
-        
-        logging.info(f"After filtering: {len(filtered_files)} files to process (skipped {len(video_files) - len(filtered_files)})")
-        video_files = filtered_files
+    if use_batched:
+        # Longest files first (size as a proxy for duration), so files of similar
+        # length run side by side and the workers finish close together
+        video_files.sort(key=lambda video_file: video_file.stat().st_size, reverse=True)
     
     # Process videos
-    results = []
     start_time = time.time()
     
-    # Function to process a single video
+    # Whisper models keep per-call decoding state (kv-cache hooks) on the model itself,
+    # so each worker thread transcribes with its own instance; the first worker takes
+    # the model loaded above and any further workers load their own on first use
+    spare_models = [model]
+    models_lock = threading.Lock()
+    worker_state = threading.local()
+    # Model slot for the next additional worker (slot 0 is the model loaded above)
+    model_slots = itertools.count(1)
+    
+    # At least one worker per selected GPU
+    if device_indices:
+        max_workers = max(max_workers, len(device_indices))
+    
+    def get_worker_model():
+        worker_model = getattr(worker_state, "model", None)
+        if worker_model is None:
+            with models_lock:
+                worker_model = spare_models.pop() if spare_models else None
+                if worker_model is None:
+                    # Assign GPUs to additional workers round-robin
+                    slot = next(model_slots)
+                    device_index = device_indices[slot % len(device_indices)] if device_indices else None
+            if worker_model is None:
+                logging.info(f"Loading additional model for worker {threading.current_thread().name}")
+                worker_model = load_transcription_model(model_size, device, compute_type, device_index=device_index,
+                                                        backend=backend, cache=False,
+                                                        compile_model=compile_model)
+                if worker_model is None:
+                    raise RuntimeError("Failed to load transcription model for worker")
+            worker_state.model = worker_model
+        return worker_model
+    
+    # ffmpeg decodes in its own process, so a thread pool is enough to decode upcoming
+    # files while the workers run the model; only a bounded window of files is decoded
+    # ahead, since each decoded file stays in memory until a worker picks it up
+    extract_executor = ThreadPoolExecutor(max_workers=extract_workers, thread_name_prefix="extract") if extract_workers > 0 else None
+    prefetch_depth = max_workers + extract_workers
+    audio_futures = {}
+    extract_lock = threading.Lock()
+    next_extract = 0
+    
+    def get_audio(file_index):
+        nonlocal next_extract
+        if extract_executor is None:
+            return None
+        with extract_lock:
+            while next_extract < min(file_index + prefetch_depth, len(video_files)):
+                audio_futures[next_extract] = extract_executor.submit(load_media_audio, video_files[next_extract])
+                next_extract += 1
+            future = audio_futures.pop(file_index)
+        return future.result()
+    
+    # Function to transcribe a single video; workers only run the model; the
+    # resulting transcript is formatted and written by the collecting thread below
     def process_single_video(video_file, file_index):
+        output_file = None
         try:
-            # Ensure rel_path is always a Path object suitable for .with_suffix()
-            if input_path.is_dir():
-                rel_path = video_file.relative_to(input_path) 
-            else:
-                # When input is a file, rel_path is just the filename
-                rel_path = Path(video_file.name) # Ensure it's a Path object
-
-            output_file = output_path / rel_path.with_suffix(f".{output_format}")
-            
-            # Create subdirectories in output path if needed
-            output_file.parent.mkdir(parents=True, exist_ok=True)
+            output_file = get_output_file(video_file)
             
             # Update progress if callback provided
             if progress_callback:
                 if not progress_callback(file_index, len(video_files), str(video_file)):
                     # Processing was cancelled
-                    return (str(video_file), False, "Cancelled by user")
+                    return (video_file, output_file, None, "Cancelled by user")
             
             logging.info(f"Processing {video_file}")
-            success = transcribe_file(
-                model, 
-                video_file, 
-                output_file, 
-                output_format=output_format,
-                language=language
-            )
+            audio = get_audio(file_index)
+            if use_batched:
+                transcription = transcribe_media_batched(
+                    get_worker_model(),
+                    video_file,
+                    language=language,
+                    batch_size=batch_size,
+                    compute_type=compute_type,
+                    audio=audio
+                )
+            else:
+                transcription = transcribe_media(
+                    get_worker_model(), 
+                    video_file, 
+                    language=language,
+                    compute_type=compute_type,
+                    fast_preset=fast_preset,
+                    audio=audio,
+                    vad=vad,
+                    beam_size=beam_size
+                )
+                
+            if transcription is not None and fast_preset:
+                transcription = filter_repeated_segments(transcription)
             
-            if success:
-                return (str(video_file), True, "")
+            if transcription is not None:
+                return (video_file, output_file, transcription, "")
             else:
-                return (str(video_file), False, "Transcription failed")
+                return (video_file, output_file, None, "Transcription failed")
         except Exception as e:
             error_msg = str(e)
             logging.error(f"Error processing {video_file}: {error_msg}")
-            return (str(video_file), False, error_msg)
+            return (video_file, output_file, None, error_msg)
     
-    # Use ThreadPoolExecutor for concurrent processing
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all tasks
-        future_to_file = {executor.submit(process_single_video, file, i): file 
-                          for i, file in enumerate(video_files)}
-        
-        # Process as they complete
-        for future in as_completed(future_to_file):
-            result = future.result()
-            results.append(result)
-            file_path, success, error_msg = result
+    try:
+        # Use ThreadPoolExecutor for concurrent processing
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Submit all tasks
+            future_to_file = {executor.submit(process_single_video, file, i): file 
+                              for i, file in enumerate(video_files)}
             
-            if success:
-                logging.info(f"Successfully processed: {file_path}")
-            else:
-                logging.error(f"Failed to process: {file_path} - {error_msg}")
+            # Process as they complete
+            for future in as_completed(future_to_file):
+                video_file, output_file, transcription, error_msg = future.result()
+                
+                success = False
+                if transcription is not None:
+                    success = save_transcription(transcription, output_file, output_format=output_format)
+                    if not success:
+                        error_msg = "Failed to save transcription"
+                    else:
+                        transcript_cache[get_cache_key(video_file)] = signatures[video_file]
+                        cache_changed = True
+                        
+                file_path = str(video_file)
+                results.append((file_path, success, error_msg))
+                
+                if success:
+                    logging.info(f"Successfully processed: {file_path}")
+                else:
+                    logging.error(f"Failed to process: {file_path} - {error_msg}")
+        
+    finally:
+        if extract_executor is not None:
+            # Drop decodes queued for files that were never reached (cancelled runs)
+            extract_executor.shutdown(wait=False, cancel_futures=True)
+        if cache_changed:
+            save_transcript_cache(output_path, transcript_cache)
     
     # Summarize results
     elapsed_time = time.time() - start_time
@@ -251,11 +506,19 @@ def main():
     parser.add_argument("output", help="Output directory", type=str)
     parser.add_argument("--model", help="Model size", choices=["tiny.en", "base.en", "small.en", "medium.en", "large-v3"], default="base.en")
     parser.add_argument("--device", help="Device to use", choices=["auto", "cuda", "cpu"], default="auto")
-    parser.add_argument("--compute-type", help="Compute type", choices=["default", "float16", "int8"], default="default")
+    parser.add_argument("--backend", help="Inference backend", choices=["openai-whisper", "faster-whisper"], default="openai-whisper")
+    parser.add_argument("--compute-type", help="Compute type", choices=["auto", "default", "float32", "float16", "int8", "int8_float16"], default="auto")
     parser.add_argument("--format", help="Output format", choices=["srt", "vtt", "txt", "json", "tsv"], default="srt")
     parser.add_argument("--workers", help="Number of concurrent workers", type=int, default=1)
+    parser.add_argument("--extract-workers", help="Number of files decoded to audio ahead of the workers (0 = decode in the workers)", type=int, default=1)
     parser.add_argument("--language", help="Language code", type=str, default="en")
     parser.add_argument("--skip-processed", help="Skip already processed files", action="store_true")
+    parser.add_argument("--force", help="Transcribe again even if the transcript is up to date", action="store_true")
+    parser.add_argument("--beam-size", help="Beams searched per window (1 = greedy decoding)", type=int, default=1)
+    parser.add_argument("--no-vad", help="Transcribe the whole audio, not just the speech Silero VAD finds", action="store_true")
+    parser.add_argument("--fast", help="Greedy decoding without previous-text conditioning, VAD, repetition filter", action="store_true")
+    parser.add_argument("--compile", help="Compile the model with torch.compile (CUDA, openai-whisper only)", action="store_true")
+    parser.add_argument("--batch-size", help="Decode 30s windows in batches of this size (0 = sequential)", type=int, default=0)
     parser.add_argument("--log-level", help="Logging level", choices=["DEBUG", "INFO", "WARNING", "ERROR"], default="INFO")
     
     args = parser.parse_args()
@@ -278,7 +541,16 @@ def main():
             args.format,
             args.workers,
             args.language,
-            args.skip_processed
+            args.skip_processed,
+            use_batched=args.batch_size > 0,
+            batch_size=args.batch_size,
+            fast_preset=args.fast,
+            extract_workers=args.extract_workers,
+            force=args.force,
+            backend=args.backend,
+            vad=not args.no_vad,
+            beam_size=args.beam_size,
+            compile_model=args.compile
         )
         
         # Print summary
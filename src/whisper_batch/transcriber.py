@@ -6,17 +6,104 @@ import platform
 import os
 import sys
 import ctypes
+import functools
+import gc
+import numpy as np
+import threading
+import json
 import whisper
 
+try:
+    # Optional: faster JSON serialization for the json output format
+    import orjson
+except ImportError:
+    orjson = None
+
 # Use shared logging configuration from the package
 from whisper_batch import DEFAULT_LOG_FORMAT
+from whisper_batch.audio_extractor import extract_audio_to_array
+# Media file discovery lives in file_handler; re-exported from here (see __all__)
+from whisper_batch.file_handler import is_media_file, get_media_files
+
+__all__ = [
+    "BACKENDS", "COMPUTE_TYPE_FP16", "CRITICAL_CUDA_DLLS",
+    "get_device", "resolve_compute_type", "load_transcription_model", "unload_transcription_model",
+    "load_media_audio", "transcribe_media", "transcribe_media_batched", "filter_repeated_segments",
+    "ensure_output_dir", "save_transcription", "transcribe_file",
+    "is_media_file", "get_media_files",
+]
 
 # Configure basic logging if not already configured
 if not logging.getLogger().handlers:
     logging.basicConfig(level=logging.INFO, format=DEFAULT_LOG_FORMAT)
 
-# Global variable to hold the loaded model (to avoid reloading unnecessarily)
+# Models loaded in this process, keyed by (backend, model_size, device, compute_type),
+# so later runs and batches reuse them instead of reloading the weights
 _model_cache = {}
+_model_cache_lock = threading.Lock()
+
+# Inference backends load_transcription_model can load a model for
+BACKENDS = ("openai-whisper", "faster-whisper")
+
+# Compute types offered by the front ends, mapped to Whisper's fp16 decoding switch.
+# openai-whisper has no INT8 kernels, so the int8 variants run at the nearest precision
+# it does have: int8_float16 decodes in half precision, int8 in full precision (on the
+# CPU, load_transcription_model loads an int8 faster-whisper model instead).
+COMPUTE_TYPE_FP16 = {
+    "float32": False,
+    "float16": True,
+    "int8": False,
+    "int8_float16": True,
+}
+
+# Write buffer for transcript files; large enough that most transcripts reach the
+# disk in a single write() however many small pieces the writers emit
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+# Silero VAD model for the fast preset, loaded on first use; get_speech_timestamps
+# resets and updates the model's state, so workers take turns with it
+_vad_model = None
+_vad_lock = threading.Lock()
+_vad_missing_logged = False
+
+# Shortest pause that splits two VAD speech regions
+VAD_MIN_SILENCE_MS = 500
+
+# Temperatures a window is decoded at, in turn, until the output passes the
+# compression-ratio and log-probability checks (the fast preset stops at 0.0)
+DECODE_TEMPERATURES = (0.0, 0.2, 0.4)
+
+# Windows DLLs GPU inference needs, and where _missing_cuda_dlls looks for them
+CRITICAL_CUDA_DLLS = ("cudnn_ops64_9.dll", "cudnn64_8.dll", "cublas64_11.dll")
+_CUDA_DLL_DIRS = tuple(
+    Path(base_path) / subdir
+    for base_path in (
+        os.environ.get('CUDA_PATH', ''),
+        os.path.join(os.environ.get('PROGRAMFILES', ''), 'NVIDIA GPU Computing Toolkit', 'CUDA'),
+        os.getcwd(),
+        os.path.dirname(os.path.abspath(__file__)),
+    )
+    if base_path
+    # Check bin directory and root directory
+    for subdir in ('bin', '')
+)
+
+@functools.lru_cache(maxsize=1)
+def _missing_cuda_dlls():
+    """
+    Find the critical CUDA DLLs that are not in any of the CUDA directories.
+    
+    Only Windows ships these DLLs; elsewhere nothing is reported missing.
+    
+    Returns:
+        Tuple of the missing DLL names
+    """
+    if platform.system() != "Windows":
+        return ()
+    return tuple(
+        dll for dll in CRITICAL_CUDA_DLLS
+        if not any((dll_dir / dll).is_file() for dll_dir in _CUDA_DLL_DIRS)
+    )
 
 def get_device(device_preference="auto"):
     """
@@ -34,44 +121,12 @@ def get_device(device_preference="auto"):
     
     # Check if CUDA is available through PyTorch
     try:
-        import torch
         has_cuda = torch.cuda.is_available()
         if has_cuda:
             logging.info(f"CUDA is available with device: {torch.cuda.get_device_name(0)}")
             
-            # Check for critical CUDA DLLs
-            critical_dlls = ["cudnn_ops64_9.dll", "cudnn64_8.dll", "cublas64_11.dll"]
-            dll_paths = [
-                os.environ.get('CUDA_PATH', ''),
-                os.path.join(os.environ.get('PROGRAMFILES', ''), 'NVIDIA GPU Computing Toolkit', 'CUDA'),
-                os.getcwd(),
-                os.path.dirname(os.path.abspath(__file__)),
-            ]
-            
-            # Check if the critical DLLs are accessible
-            missing_dlls = []
-            for dll in critical_dlls:
-                found = False
-                for base_path in dll_paths:
-                    if not base_path:
-                        continue
-                    
-                    # Check bin directory and root directory
-                    potential_paths = [
-                        os.path.join(base_path, 'bin', dll),
-                        os.path.join(base_path, dll)
-                    ]
-                    
-                    for path in potential_paths:
-                        if os.path.exists(path):
-                            found = True
-                            break
-                    
-                    if found:
-                        break
-                
-                if not found:
-                    missing_dlls.append(dll)
+            # Check for critical CUDA DLLs (probed once per process)
+            missing_dlls = _missing_cuda_dlls()
             
             if missing_dlls:
                 dll_list = ", ".join(missing_dlls)
@@ -113,33 +168,169 @@ def get_device(device_preference="auto"):
     # Default to CPU if CUDA is not available or there was an error
     return "cpu"
 
-def load_transcription_model(model_size="base.en", device="auto", compute_type="default"):
+def resolve_compute_type(device, compute_type="auto"):
+    """
+    Pick a concrete compute type for "auto" on the given device.
+    
+    float16 on GPUs with Tensor Cores (compute capability 7.0 and up),
+    int8_float16 on older GPUs and int8 on the CPU. Other values are returned
+    unchanged.
+    
+    Args:
+        device: "cpu", "cuda" or "cuda:<index>"
+        compute_type: Requested compute type
+    
+    Returns:
+        The compute type to use
+    """
+    if compute_type != "auto":
+        return compute_type
+    if not device.startswith("cuda"):
+        return "int8"
+    
+    _, _, index = device.partition(":")
+    try:
+        major, _ = torch.cuda.get_device_capability(int(index or 0))
+    except Exception as e:
+        logging.warning(f"Could not read the compute capability of {device}: {e}")
+        return "int8_float16"
+    return "float16" if major >= 7 else "int8_float16"
+
+def _load_model(model_size, device, compute_type, device_index, backend, cache=True, compile_model=False):
+    """Load a model for backend on device ("cuda" or "cpu"), or reuse the cached one."""
+    if not cache:
+        return _create_model(model_size, device, compute_type, device_index, backend, compile_model)
+    
+    key = (backend, model_size, f"cuda:{device_index or 0}" if device == "cuda" else device, compute_type,
+           compile_model)
+    with _model_cache_lock:
+        model = _model_cache.get(key)
+        if model is not None:
+            logging.info(f"Reusing loaded Whisper model: {model_size} on {key[2]}")
+            return model
+        model = _create_model(model_size, device, compute_type, device_index, backend, compile_model)
+        _model_cache[key] = model
+        return model
+
+def _create_model(model_size, device, compute_type, device_index, backend, compile_model=False):
+    """Load a model for backend on device ("cuda" or "cpu")."""
+    if backend == "faster-whisper":
+        # CTranslate2 backend; compute_type selects its quantized/half-precision kernels
+        model = WhisperModel(model_size, device=device, device_index=device_index or 0, compute_type=compute_type)
+    else:
+        model = whisper.load_model(
+            model_size,
+            device=f"cuda:{device_index}" if device == "cuda" and device_index is not None else device,
+            download_root=None,
+            in_memory=False,
+        )
+        
+    if device == "cuda":
+        if compile_model and backend == "openai-whisper":
+            # Warms the model up as part of compiling it
+            _compile_model(model)
+        else:
+            _warm_up_model(model)
+    return model
+
+def _compile_model(model):
+    """
+    Compile the encoder and decoder of an openai-whisper model with torch.compile.
+    
+    torch.compile is lazy and only compiles (or fails, e.g. without Triton) on the
+    first forward pass, so a warm-up decode runs here; if it fails, the eager
+    encoder and decoder are put back. The decoder's kv-cache forward hooks break
+    graph capture, so it is compiled without fullgraph.
+    """
+    if not hasattr(torch, "compile"):
+        logging.warning("torch.compile needs PyTorch 2.0 or newer; running the model eagerly")
+        _warm_up_model(model)
+        return
+        
+    encoder, decoder = model.encoder, model.decoder
+    try:
+        model.encoder = torch.compile(encoder, mode="reduce-overhead", fullgraph=True)
+        model.decoder = torch.compile(decoder, mode="reduce-overhead", dynamic=True)
+        logging.info("Compiling the Whisper encoder/decoder (one-time warm-up)...")
+        _decode_silence(model)
+    except Exception as e:
+        logging.warning(f"torch.compile failed, running the model eagerly: {e}")
+        model.encoder, model.decoder = encoder, decoder
+        _warm_up_model(model)
+
+def _warm_up_model(model):
+    """
+    Run one window of silence through a freshly loaded GPU model.
+    
+    The first forward pass on a GPU creates the CUDA context, allocates the
+    cuBLAS/cuDNN workspaces and selects kernels, which takes a second or two;
+    doing it here keeps that stall out of the first file's transcription.
+    """
+    try:
+        _decode_silence(model)
+    except Exception as e:
+        # Only a latency optimization; a real problem will surface on the first file
+        logging.debug(f"Model warm-up failed: {e}")
+
+def _decode_silence(model):
+    """Decode one short window of silence with model."""
+    if isinstance(model, WhisperModel):
+        segments, _ = model.transcribe(np.zeros(whisper.audio.SAMPLE_RATE, dtype=np.float32),
+                                       language="en", beam_size=1, vad_filter=False)
+        for _ in segments:
+            pass
+    else:
+        mel = whisper.log_mel_spectrogram(torch.zeros(whisper.audio.N_SAMPLES), model.dims.n_mels)
+        options = whisper.DecodingOptions(language="en", without_timestamps=True, sample_len=8)
+        whisper.decode(model, mel.unsqueeze(0).to(model.device), options)
+
+def load_transcription_model(model_size="base.en", device="auto", compute_type="auto", device_index=None,
+                             backend="openai-whisper", cache=True, compile_model=False):
     """
     Load the Whisper transcription model.
     
     Args:
         model_size: The size of the Whisper model to load.
         device: The device to use for inference (auto, cuda, or cpu).
-        compute_type: The compute type to use (default, float16, int8).
+        compute_type: The compute type to use (auto, default or a key of COMPUTE_TYPE_FP16);
+            auto picks one for the device, see resolve_compute_type.
+        device_index: Optional CUDA device index to load the model on.
+        backend: Inference backend, one of BACKENDS. faster-whisper runs the
+            CTranslate2 port, which is several times faster on both CPU and GPU.
+        cache: Return the model already loaded with the same settings, if any, and
+            keep a newly loaded one for later calls. Pass False for a private
+            instance (openai-whisper models can't be shared between threads).
+        compile_model: Compile an openai-whisper model on CUDA with torch.compile.
+            Loading takes noticeably longer, decoding of long batches is faster.
     
     Returns:
         The loaded Whisper model, or None if loading failed.
     """
+    if backend not in BACKENDS:
+        logging.error(f"Unsupported backend: {backend}")
+        return None
+        
     try:
         # Determine the device
         actual_device = get_device(device) # Reverted to original
+        resolved_type = resolve_compute_type(
+            f"cuda:{device_index or 0}" if actual_device == "cuda" else actual_device, compute_type)
         
-        # Load the model
-        logging.info(f"Loading Whisper model: {model_size} on {actual_device} with compute type {compute_type}") # Reverted to original
-
-        model = whisper.load_model(
-            model_size,
-            device=actual_device,
-            download_root=None,
-            in_memory=False,
-        )
+        if backend == "openai-whisper" and actual_device == "cpu" and resolved_type == "int8":
+            if compute_type == "int8":
+                # openai-whisper has no INT8 kernels and would run in float32; CTranslate2's
+                # int8 weights are about a quarter of the size and decode markedly faster,
+                # which is what lets the larger models run on a laptop CPU at all
+                logging.info("Using the faster-whisper backend for int8 inference on the CPU")
+                backend = "faster-whisper"
+            else:
+                # Only switch (and download a different model) when int8 was asked for
+                logging.info("openai-whisper runs in float32 on the CPU; the faster-whisper backend "
+                             "(or compute type int8) would be markedly faster")
         
-        return model
+        # Load the model
+        logging.info(f"Loading Whisper model: {model_size} ({backend}) on {actual_device} with compute type {resolved_type}")
+        return _load_model(model_size, actual_device, resolved_type, device_index, backend, cache, compile_model)
         
     except RuntimeError as e:
         error_message = str(e)
@@ -171,12 +362,7 @@ def load_transcription_model(model_size="base.en", device="auto", compute_type="
         if device in ["auto", "cuda"] and "cpu" != get_device("cpu"):
             logging.info("Attempting to fallback to CPU...")
             try:
-                model = whisper.load_model(
-                    model_size,
-                    device="cpu",
-                    download_root=None,
-                    in_memory=False,
-                )
+                model = _load_model(model_size, "cpu", resolve_compute_type("cpu", compute_type), None, backend, cache)
                 logging.info("Successfully loaded model on CPU instead")
                 return model
             except Exception as cpu_error:
@@ -188,95 +374,451 @@ def load_transcription_model(model_size="base.en", device="auto", compute_type="
         logging.error(f"Failed to load Whisper model: {str(e)}")
         return None
 
-def is_media_file(file_path):
-    """Check if a file is a media file that can be processed."""
-    media_extensions = ['.mp4', '.avi', '.mov', '.mkv', '.webm', '.mp3', '.wav', '.m4a', '.flac']
-    return Path(file_path).suffix.lower() in media_extensions
-
-def get_media_files(directory_path):
-    """Get all media files from a directory."""
-    media_files = []
-    dir_path = Path(directory_path)
+def unload_transcription_model(model=None):
+    """
+    Drop cached models so their memory can be released.
     
-    for ext in ['.mp4', '.avi', '.mov', '.mkv', '.webm', '.mp3', '.wav', '.m4a', '.flac']:
-        media_files.extend(dir_path.glob(f'**/*{ext}'))
+    Args:
+        model: The model to drop; None drops every cached model
+    """
+    with _model_cache_lock:
+        for key in [key for key, cached in _model_cache.items() if model is None or cached is model]:
+            del _model_cache[key]
+    del model
     
-    return media_files
+    # Free the weights now rather than at the next collection, and hand the
+    # cached CUDA blocks back to the driver
+    gc.collect()
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+def load_media_audio(file_path):
+    """Decode a media file to the 16 kHz mono float32 samples transcribe_media takes."""
+    audio = extract_audio_to_array(Path(file_path))
+    if audio is None:
+        raise RuntimeError(f"Failed to load audio: {file_path}")
+    return audio
 
-def transcribe_file(model, file_path, output_file, output_format='srt', language='en'):
+def _decode_options(beam_size, fast_preset):
+    """Decoding options shared by both backends' transcribe()."""
+    # Greedy decoding without the previous-text prompt is near the beam-search
+    # accuracy for clean speech at a fraction of the decoder time; the short
+    # temperature fallback still recovers windows where greedy decoding collapses
+    return {
+        "best_of": 1,
+        "temperature": 0.0 if fast_preset else DECODE_TEMPERATURES,
+        "condition_on_previous_text": False,
+        "beam_size": 1 if fast_preset else beam_size,
+    }
+
+@functools.lru_cache(maxsize=None)
+def _whisper_decode_options(device, compute_type, beam_size, fast_preset):
     """
-    Transcribe a media file and save the result.
+    openai-whisper transcribe() options for a model on device, built once per
+    combination of settings instead of for every file (resolving "auto" queries
+    the GPU's compute capability). Returned as (name, value) pairs, since the
+    cached value must not be modified by callers.
+    """
+    options = _decode_options(beam_size, fast_preset)
+    if options["beam_size"] == 1:
+        # openai-whisper decodes greedily when no beam size is given; a beam of one
+        # would run the slower beam-search decoder to the same result
+        del options["beam_size"]
+    compute_type = resolve_compute_type(device, compute_type)
+    if compute_type in COMPUTE_TYPE_FP16:
+        # Half precision is only available on the GPU
+        options["fp16"] = COMPUTE_TYPE_FP16[compute_type] and device.startswith("cuda")
+    return tuple(options.items())
+
+def transcribe_media(model, file_path, language='en', compute_type='default', fast_preset=False, audio=None,
+                     vad=True, beam_size=1):
+    """
+    Transcribe a media file without saving the result.
     
     Args:
         model: Loaded Whisper model
         file_path: Path to media file
-        output_file: Path to save transcription
-        output_format: Format to save (srt, vtt, txt, json, tsv)
         language: Language code for transcription
+        compute_type: Decoding precision (auto, default or a key of COMPUTE_TYPE_FP16)
+        fast_preset: Decode greedily at temperature 0 without conditioning on the
+            previous window, and only where Silero VAD finds speech
+        audio: Samples already decoded from file_path by load_media_audio;
+            file_path is then only used in log messages
+        vad: Only transcribe where Silero VAD finds speech, so silence and music
+            are neither decoded nor hallucinated over (always on with fast_preset)
+        beam_size: Beams searched per window; 1 decodes greedily (always with fast_preset)
     
     Returns:
-        True if successful, False otherwise
+        The Whisper result dict, or None if transcription failed
     """
-    try:
-        # Create parent directory if it doesn't exist
-        output_file = Path(output_file)
-        output_file.parent.mkdir(parents=True, exist_ok=True)
+    vad = vad or fast_preset
+    if isinstance(model, WhisperModel):
+        return _transcribe_faster_whisper(model, file_path, language, audio, vad,
+                                          _decode_options(beam_size, fast_preset))
         
-        # Transcribe the file
+    decode_options = dict(_whisper_decode_options(str(model.device), compute_type, beam_size, fast_preset))
+    try:
         logging.info(f"Transcribing {file_path}")
-        result = model.transcribe(
-            str(file_path),
+        if audio is None:
+            audio = load_media_audio(file_path)
+        
+        if vad:
+            clip_timestamps = _speech_clip_timestamps(audio)
+            if clip_timestamps is not None:
+                if not clip_timestamps:
+                    logging.info(f"No speech detected in {file_path}")
+                    return {"text": "", "segments": [], "language": language}
+                decode_options["clip_timestamps"] = clip_timestamps
+                
+        return model.transcribe(
+            audio,
             language=language,
-            verbose=False
+            verbose=False,
+            **decode_options
         )
         
-        # Save the result in the specified format
-        if output_format == 'srt':
-            from whisper.utils import WriteSRT
-            with open(output_file, 'w', encoding='utf-8') as f:
-                writer = WriteSRT(output_file.parent)
-                writer.write_result(result, f)
-        elif output_format == 'vtt':
-            from whisper.utils import WriteVTT
-            with open(output_file, 'w', encoding='utf-8') as f:
-                writer = WriteVTT(output_file.parent)
-                writer.write_result(result)
-        elif output_format == 'txt':
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(result['text'])
-        elif output_format == 'json':
-            import json
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(result, f, indent=2, ensure_ascii=False)
-        elif output_format == 'tsv':
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write("start\tend\ttext\n")
-                for segment in result['segments']:
-                    f.write(f"{segment['start']:.2f}\t{segment['end']:.2f}\t{segment['text']}\n")
-        else:
-            logging.error(f"Unsupported output format: {output_format}")
-            return False
+    except RuntimeError as e:
+        _log_transcription_runtime_error(file_path, str(e))
+        return None
+    except Exception as e:
+        logging.error(f"Error transcribing {file_path}: {str(e)}")
+        return None
+
+def _transcribe_faster_whisper(model, file_path, language, audio, vad, decode_options):
+    """
+    transcribe_media for a faster-whisper model.
+    
+    The segments faster-whisper yields are collected into the same result dict
+    openai-whisper returns, so the writers and filters handle both backends.
+    """
+    # faster-whisper runs Silero VAD itself
+    options = {**decode_options, "vad_filter": vad}
+    if vad:
+        options["vad_parameters"] = {"min_silence_duration_ms": VAD_MIN_SILENCE_MS}
+        
+    try:
+        logging.info(f"Transcribing {file_path}")
+        if audio is None:
+            audio = load_media_audio(file_path)
             
-        logging.info(f"Transcription saved to {output_file}")
-        return True
+        # transcribe() returns a lazy generator; decoding happens as it is consumed
+        segments, info = model.transcribe(audio, language=language, **options)
+        result_segments = [
+            {
+                "id": index,
+                "seek": segment.seek,
+                "start": segment.start,
+                "end": segment.end,
+                "text": segment.text,
+                "tokens": segment.tokens,
+                "temperature": segment.temperature,
+                "avg_logprob": segment.avg_logprob,
+                "compression_ratio": segment.compression_ratio,
+                "no_speech_prob": segment.no_speech_prob,
+            }
+            for index, segment in enumerate(segments)
+        ]
+        return {
+            "text": "".join(segment["text"] for segment in result_segments),
+            "segments": result_segments,
+            "language": info.language,
+        }
         
     except RuntimeError as e:
-        error_message = str(e)
+        _log_transcription_runtime_error(file_path, str(e))
+        return None
+    except Exception as e:
+        logging.error(f"Error transcribing {file_path}: {str(e)}")
+        return None
+
+def transcribe_media_batched(model, file_path, language='en', batch_size=16, compute_type='default', audio=None):
+    """
+    Transcribe a media file by decoding its 30s windows in batches.
+    
+    Windows are decoded independently (no conditioning on the previous window and no
+    temperature fallback), so up to batch_size of them go through the model per
+    forward pass. Each window becomes one segment spanning the whole window.
+    
+    Args:
+        model: Loaded Whisper model
+        file_path: Path to media file
+        language: Language code for transcription (None to detect per window)
+        batch_size: Number of windows decoded per forward pass
+        compute_type: Decoding precision (auto, default or a key of COMPUTE_TYPE_FP16)
+        audio: Samples already decoded from file_path by load_media_audio
+    
+    Returns:
+        The Whisper result dict, or None if transcription failed
+    """
+    if isinstance(model, WhisperModel):
+        # Batched window decoding is built on openai-whisper's decode()
+        logging.info("Batched decoding needs the openai-whisper backend; transcribing sequentially")
+        return transcribe_media(model, file_path, language=language, compute_type=compute_type, audio=audio)
         
-        # Handle specific CUDA errors during transcription
-        if "CUDA out of memory" in error_message:
-            logging.error(f"CUDA ran out of memory while transcribing {file_path}")
-            logging.error("Try a smaller model or use CPU with --device cpu")
-        elif "CUDNN_STATUS_NOT_INITIALIZED" in error_message:
-            logging.error(f"CUDNN not initialized properly while transcribing {file_path}")
-            logging.error("This might be due to incompatible CUDA versions")
-        elif "cudnn_ops64_9.dll" in error_message:
-            logging.error(f"Missing cudnn_ops64_9.dll while transcribing {file_path}")
-            logging.error("Please download cuDNN from https://developer.nvidia.com/cudnn")
-        else:
-            logging.error(f"Runtime error transcribing {file_path}: {error_message}")
+    try:
+        logging.info(f"Transcribing {file_path} in batches of {batch_size} windows")
+        if audio is None:
+            audio = load_media_audio(file_path)
+        audio = torch.from_numpy(audio)
+        
+        compute_type = resolve_compute_type(str(model.device), compute_type)
+        fp16 = COMPUTE_TYPE_FP16.get(compute_type, True) and model.device.type == "cuda"
+        options = whisper.DecodingOptions(language=language, without_timestamps=True, fp16=fp16)
+        
+        window = whisper.audio.N_SAMPLES
+        window_starts = range(0, max(len(audio), 1), window)
+        segments = []
+        detected_language = language
+        for batch_start in range(0, len(window_starts), batch_size):
+            batch = window_starts[batch_start:batch_start + batch_size]
+            mel = torch.stack([
+                whisper.log_mel_spectrogram(whisper.pad_or_trim(audio[start:start + window]), model.dims.n_mels)
+                for start in batch
+            ]).to(model.device)
             
-        return False
+            for start, decoded in zip(batch, whisper.decode(model, mel, options)):
+                detected_language = detected_language or decoded.language
+                text = decoded.text.strip()
+                
+                # Same silence test transcribe() applies before emitting a window
+                if not text or (decoded.no_speech_prob > 0.6 and decoded.avg_logprob < -1.0):
+                    continue
+                    
+                segments.append({
+                    "id": len(segments),
+                    "seek": start // whisper.audio.HOP_LENGTH,
+                    "start": start / whisper.audio.SAMPLE_RATE,
+                    "end": min(start + window, len(audio)) / whisper.audio.SAMPLE_RATE,
+                    "text": f" {text}",
+                    "tokens": decoded.tokens,
+                    "temperature": decoded.temperature,
+                    "avg_logprob": decoded.avg_logprob,
+                    "compression_ratio": decoded.compression_ratio,
+                    "no_speech_prob": decoded.no_speech_prob,
+                })
+                
+        return {
+            "text": "".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "language": detected_language,
+        }
+        
+    except RuntimeError as e:
+        _log_transcription_runtime_error(file_path, str(e))
+        return None
     except Exception as e:
         logging.error(f"Error transcribing {file_path}: {str(e)}")
-        return False 
\ No newline at end of file
+        return None
+
+def _speech_clip_timestamps(audio, min_silence_duration_ms=VAD_MIN_SILENCE_MS):
+    """
+    Find the speech regions of an audio clip with Silero VAD.
+    
+    Args:
+        audio: Mono float32 samples at 16 kHz
+        min_silence_duration_ms: Shortest pause that splits two speech regions
+    
+    Returns:
+        Flat [start, end, start, end, ...] list in seconds for transcribe()'s
+        clip_timestamps, or None if Silero VAD is not installed
+    """
+    global _vad_model, _vad_missing_logged
+    
+    try:
+        from silero_vad import load_silero_vad, get_speech_timestamps
+    except ImportError:
+        if not _vad_missing_logged:
+            logging.warning("silero-vad is not installed; transcribing without VAD")
+            _vad_missing_logged = True
+        return None
+        
+    with _vad_lock:
+        if _vad_model is None:
+            _vad_model = load_silero_vad()
+        regions = get_speech_timestamps(
+            torch.from_numpy(audio),
+            _vad_model,
+            sampling_rate=whisper.audio.SAMPLE_RATE,
+            min_silence_duration_ms=min_silence_duration_ms,
+            return_seconds=True,
+        )
+        
+    return [bound for region in regions for bound in (region["start"], region["end"])]
+
+def filter_repeated_segments(result, ngram_size=3, max_repeats=2):
+    """
+    Remove Whisper's repetition-loop output from a transcription result.
+    
+    Word n-grams (up to ngram_size words) repeated back to back more than
+    max_repeats times are cut down to max_repeats copies, and segments that
+    repeat the previous segment's text are dropped.
+    
+    Args:
+        result: Whisper result dict
+        ngram_size: Longest word n-gram checked for repeats
+        max_repeats: Consecutive copies of an n-gram that are kept
+    
+    Returns:
+        A new result dict with the filtered segments and text
+    """
+    segments = []
+    previous_text = None
+    for segment in result["segments"]:
+        text = _collapse_repeated_ngrams(segment["text"], ngram_size, max_repeats)
+        normalized = text.strip().lower()
+        if not normalized or normalized == previous_text:
+            continue
+        previous_text = normalized
+        segments.append({**segment, "id": len(segments), "text": text})
+        
+    return {**result, "segments": segments, "text": "".join(segment["text"] for segment in segments)}
+
+def _collapse_repeated_ngrams(text, ngram_size, max_repeats):
+    """Cut back-to-back repeats of any word n-gram in text down to max_repeats copies."""
+    words = text.split()
+    kept = []
+    for word in words:
+        kept.append(word)
+        for n in range(1, ngram_size + 1):
+            span = n * (max_repeats + 1)
+            if len(kept) >= span and kept[-span:] == kept[-n:] * (max_repeats + 1):
+                del kept[-n:]
+                break
+                
+    if len(kept) == len(words):
+        return text
+    return (" " if text.startswith(" ") else "") + " ".join(kept)
+
+def _log_transcription_runtime_error(file_path, error_message):
+    """Log a RuntimeError raised while transcribing, with hints for common CUDA errors."""
+    if "CUDA out of memory" in error_message:
+        logging.error(f"CUDA ran out of memory while transcribing {file_path}")
+        logging.error("Try a smaller model or use CPU with --device cpu")
+    elif "CUDNN_STATUS_NOT_INITIALIZED" in error_message:
+        logging.error(f"CUDNN not initialized properly while transcribing {file_path}")
+        logging.error("This might be due to incompatible CUDA versions")
+    elif "cudnn_ops64_9.dll" in error_message:
+        logging.error(f"Missing cudnn_ops64_9.dll while transcribing {file_path}")
+        logging.error("Please download cuDNN from https://developer.nvidia.com/cudnn")
+    else:
+        logging.error(f"Runtime error transcribing {file_path}: {error_message}")
+
+def ensure_output_dir(directory):
+    """Create an output directory and its parents if they don't exist."""
+    # Not remembered between calls: the directory may have been removed since
+    Path(directory).mkdir(parents=True, exist_ok=True)
+
+def _fmt_ts(seconds, decimal_marker=",", always_include_hours=True):
+    """Format seconds as [HH:]MM:SS,mmm the way whisper.utils does, with integer math."""
+    milliseconds = round(seconds * 1000.0)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    if always_include_hours or hours:
+        return "%02d:%02d:%02d%s%03d" % (hours, minutes, seconds, decimal_marker, milliseconds)
+    return "%02d:%02d%s%03d" % (minutes, seconds, decimal_marker, milliseconds)
+
+def _subtitle_text(segment):
+    # "-->" in the text would read as a cue timing line
+    return segment['text'].strip().replace("-->", "->")
+
+# whisper.utils' WriteSRT/WriteVTT print (and flush) every cue separately; these
+# write the same output through the buffered file in one writelines call
+def _write_srt(result, output_file):
+    with open(output_file, 'w', encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE) as f:
+        f.writelines(f"{i}\n{_fmt_ts(segment['start'])} --> {_fmt_ts(segment['end'])}\n{_subtitle_text(segment)}\n\n"
+                     for i, segment in enumerate(result['segments'], start=1))
+
+def _write_vtt(result, output_file):
+    with open(output_file, 'w', encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE) as f:
+        f.write("WEBVTT\n\n")
+        f.writelines(f"{_fmt_ts(segment['start'], '.', False)} --> {_fmt_ts(segment['end'], '.', False)}\n"
+                     f"{_subtitle_text(segment)}\n\n"
+                     for segment in result['segments'])
+
+def _write_txt(result, output_file):
+    with open(output_file, 'w', encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE) as f:
+        f.write(result['text'])
+
+def _write_json(result, output_file):
+    if orjson is not None:
+        # orjson serializes straight to UTF-8 bytes several times faster than json
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        # json.dump encodes piece by piece into the buffered file, so the
+        # document is never built as one string
+        with open(output_file, 'w', encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE) as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+
+def _write_tsv(result, output_file):
+    with open(output_file, 'w', encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE) as f:
+        f.write("start\tend\ttext\n")
+        f.writelines(f"{segment['start']:.2f}\t{segment['end']:.2f}\t{segment['text']}\n"
+                     for segment in result['segments'])
+
+# Writer for each output format, called as writer(result, output_file)
+_WRITERS = {
+    'srt': _write_srt,
+    'vtt': _write_vtt,
+    'txt': _write_txt,
+    'json': _write_json,
+    'tsv': _write_tsv,
+}
+
+def save_transcription(result, output_file, output_format='srt'):
+    """
+    Save a transcription result in the requested format.
+    
+    Args:
+        result: Whisper result dict
+        output_file: Path to save transcription
+        output_format: Format to save (srt, vtt, txt, json, tsv)
+    
+    Returns:
+        True if successful, False otherwise
+    """
+    writer = _WRITERS.get(output_format)
+    if writer is None:
+        logging.error(f"Unsupported output format: {output_format}")
+        return False
+        
+    try:
+        # Create parent directory if it doesn't exist
+        output_file = Path(output_file)
+        ensure_output_dir(output_file.parent)
+        
+        writer(result, output_file)
+        logging.info(f"Transcription saved to {output_file}")
+        return True
+        
+    except Exception as e:
+        logging.error(f"Error saving transcription to {output_file}: {str(e)}")
+        return False
+
+def transcribe_file(model, file_path, output_file, output_format='srt', language='en', compute_type='default'):
+    """
+    Transcribe a media file and save the result.
+    
+    Args:
+        model: Loaded Whisper model
+        file_path: Path to media file
+        output_file: Path to save transcription
+        output_format: Format to save (srt, vtt, txt, json, tsv)
+        language: Language code for transcription
+        compute_type: Decoding precision (auto, default or a key of COMPUTE_TYPE_FP16)
+    
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        # Decoded once here and handed to transcribe_media, which would otherwise decode it itself
+        audio = load_media_audio(file_path)
+    except Exception as e:
+        logging.error(f"Error decoding {file_path}: {str(e)}")
+        return False
+    
+    result = transcribe_media(model, file_path, language=language, compute_type=compute_type, audio=audio)
+    if result is None:
+        return False
+    return save_transcription(result, output_file, output_format=output_format)
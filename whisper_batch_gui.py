@@ -1 +1,30 @@
-import logging
\ No newline at end of file
+"""
+Launcher for the Whisper Batch GUI.
+
+Starts the Qt GUI when qtpy is installed and the Tkinter GUI otherwise. Only
+the chosen toolkit is imported, so the Tkinter GUI never loads Qt.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+# Make the src package importable when run from a checkout
+project_root = Path(__file__).resolve().parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+# find_spec looks the package up without importing it
+USE_QT = importlib.util.find_spec("qtpy") is not None
+
+def main():
+    """Start the Qt GUI if available, falling back to the Tkinter GUI."""
+    if USE_QT:
+        from src.gui.qtpy_app import main as qtpy_main
+        qtpy_main()
+    else:
+        from src.gui.tkinter_app import main as tkinter_main
+        tkinter_main()
+
+if __name__ == "__main__":
+    main()